@@ -1,40 +1,58 @@
-import fitz
-from curl_cffi import requests
-from datetime import datetime
+from __future__ import annotations
+from datetime import date, datetime
 import random
 import time
 import re
+import os
+import json
 import threading
-from typing import List, Dict, Optional
+from typing import Callable, Iterator, List, Dict, Optional, Set
+
+import coordinator
+import market_calendar
+import proxy_pool
+import serialization
+import tracing
+import webhook
+from lazy import lazy_import, report_startup
+from records import Announcement
+from upload_buffer import LatencyTracker, UploadBuffer
+from work_queue import BACKFILL, FRESH, WorkQueue
+
+fitz = lazy_import("fitz")
+requests = lazy_import("curl_cffi.requests")
 
 
 class PDFProcessor:
     @staticmethod
     def convert(pdf_url: str, scraper: 'Scraper') -> Optional[str]:
         try:
-            response = scraper.make_request(pdf_url, "PDFProcessor")
+            with tracing.span("pdf_fetch"):
+                response = scraper.make_request(pdf_url, "PDFProcessor")
             if not response:
                 return None
 
-            pdf_document = fitz.open(stream=response.content, filetype="pdf")
-            return "\n\n".join(
-                f"Page {i+1}:\n{pdf_document.load_page(i).get_text()}"
-                for i in range(pdf_document.page_count)
-            )
+            with tracing.span("pdf_convert", bytes=len(response.content)) as span:
+                pdf_document = fitz.open(stream=response.content, filetype="pdf")
+                span.count(pages=pdf_document.page_count)
+                return "\n\n".join(
+                    f"Page {i+1}:\n{pdf_document.load_page(i).get_text()}"
+                    for i in range(pdf_document.page_count)
+                )
         except Exception as e:
             print(f"PDF Conversion Error: {e}")
             return None
 
 class Parser:
     @staticmethod
-    def parse_entry(entry: Dict, scraper: 'Scraper') -> Optional[Dict]:
+    def parse_entry(entry: Dict, scraper: 'Scraper') -> Optional[Announcement]:
         if not entry.get('SLONGNAME', '').strip():
             print(f"Skipping NEWSID: {entry['NEWSID']} - Empty SLONGNAME")
             return None
 
         pdf_url, pdf_text = None, None
         if entry["ATTACHMENTNAME"]:
-            pdf_url = f"https://www.bseindia.com/xml-data/corpfiling/AttachLive/{entry['ATTACHMENTNAME']}"
+            pdf_url = f"{scraper.ATTACHMENT_URL}{entry['ATTACHMENTNAME']}"
             pdf_text = PDFProcessor.convert(pdf_url, scraper)
 
         data = {
@@ -58,12 +76,12 @@ class Parser:
 
         Parser._process_headline(data)
         Parser._categorize_news(data)
-        return data
+        return Announcement.from_dict(data)
 
     @staticmethod
     def _process_headline(data: Dict) -> None:
         if data["HEADLINE"]:
-            parts = re.split(r"\s-\s", data["HEADLINE"])
+            parts = HEADLINE_SEPARATOR.split(data["HEADLINE"])
             if parts:
                 data["COMPANY_NAME"] = parts[0].strip() if not parts[0].startswith('-') else None
                 if len(parts) > 1:
@@ -73,20 +91,126 @@ class Parser:
 
     @staticmethod
     def _categorize_news(data: Dict) -> None:
-        if "Transcript" in data.get("DETAIL", ""):
-            data.update({"NEWS_TYPE": "Earnings Call Transcript", "SUB_CAT_TYPE": "Earnings Call Transcript"})
-        elif "audio recording" in data.get("DETAIL", "").lower():
-            data.update({"NEWS_TYPE": "Audio Recording", "SUB_CAT_TYPE": "Audio Recording"})
-        elif data.get("SUB_CAT_TYPE") in [
-            "Postal Ballot", "Allotment of ESOP / ESPS", "Allotment of Equity Shares",
-            "Analyst / Investor Meet", "New Listing", "Publication"
-        ]:
-            data["NEWS_TYPE"] = data["SUB_CAT_TYPE"]
-        elif data.get("SUB_CAT_TYPE") in ["Investor Presentation", "Reg. 34 (1) Annual Report"] or \
-             data.get("NEWS_TYPE") in ["Earnings Call Transcript", "Audio Recording"]:
-            data["NEWS_TYPE"] = "Analytical Updates"
-        else:
-            data.setdefault("NEWS_TYPE", "Others")
+        CATEGORIZE(data)
+
+HEADLINE_SEPARATOR = re.compile(r"\s-\s")
+
+def categorize_builtin(data: Dict) -> Dict:
+    if "Transcript" in data.get("DETAIL", ""):
+        data.update({"NEWS_TYPE": "Earnings Call Transcript", "SUB_CAT_TYPE": "Earnings Call Transcript"})
+    elif "audio recording" in data.get("DETAIL", "").lower():
+        data.update({"NEWS_TYPE": "Audio Recording", "SUB_CAT_TYPE": "Audio Recording"})
+    elif data.get("SUB_CAT_TYPE") in [
+        "Postal Ballot", "Allotment of ESOP / ESPS", "Allotment of Equity Shares",
+        "Analyst / Investor Meet", "New Listing", "Publication"
+    ]:
+        data["NEWS_TYPE"] = data["SUB_CAT_TYPE"]
+    elif data.get("SUB_CAT_TYPE") in ["Investor Presentation", "Reg. 34 (1) Annual Report"] or \
+         data.get("NEWS_TYPE") in ["Earnings Call Transcript", "Audio Recording"]:
+        data["NEWS_TYPE"] = "Analytical Updates"
+    else:
+        data.setdefault("NEWS_TYPE", "Others")
+    return data
+
+# The built-in chain above as a rule table, the starting point for a BSE_CATEGORY_RULES file.
+# Rules are ordered and the first rule with any matching condition wins. Conditions are
+# (field, op, value) with op "contains", "icontains" or "in"; assigned values may reference
+# other fields as "{FIELD}".
+CATEGORY_RULES = [
+    ([("DETAIL", "contains", "Transcript")],
+     {"NEWS_TYPE": "Earnings Call Transcript", "SUB_CAT_TYPE": "Earnings Call Transcript"}),
+    ([("DETAIL", "icontains", "audio recording")],
+     {"NEWS_TYPE": "Audio Recording", "SUB_CAT_TYPE": "Audio Recording"}),
+    ([("SUB_CAT_TYPE", "in", ["Postal Ballot", "Allotment of ESOP / ESPS", "Allotment of Equity Shares",
+                              "Analyst / Investor Meet", "New Listing", "Publication"])],
+     {"NEWS_TYPE": "{SUB_CAT_TYPE}"}),
+    ([("SUB_CAT_TYPE", "in", ["Investor Presentation", "Reg. 34 (1) Annual Report"]),
+      ("NEWS_TYPE", "in", ["Earnings Call Transcript", "Audio Recording"])],
+     {"NEWS_TYPE": "Analytical Updates"}),
+]
+DEFAULT_CATEGORY = {"NEWS_TYPE": "Others"}
+
+class Categorizer:
+    """Rule table compiled once into a membership dict per field and a priority-sorted literal list."""
+    def __init__(self, rules: List, default: Dict[str, str]):
+        self.default = list(default.items())
+        # Per rule: the constant assignments, and the "{FIELD}" templates or None when there are none.
+        self.assignments = []
+        for _, assign in rules:
+            templates = [(k, v) for k, v in assign.items() if "{" in v]
+            self.assignments.append(({k: v for k, v in assign.items() if "{" not in v}, templates or None))
+        lookups: Dict[str, Dict[str, int]] = {}
+        self.literals = []
+        for rule_id, (conditions, _) in enumerate(rules):
+            for field, op, value in conditions:
+                if op == "in":
+                    lookup = lookups.setdefault(field, {})
+                    for item in value:
+                        lookup.setdefault(item, rule_id)
+                elif op == "contains":
+                    self.literals.append((rule_id, field, value, False))
+                elif op == "icontains":
+                    self.literals.append((rule_id, field, value.lower(), True))
+                else:
+                    raise ValueError(f"Unknown categorization op: {op}")
+        self.lookups = list(lookups.items())
+        # Fields checked case-insensitively more than once are lower-cased once per entry.
+        folded = [field for _, field, _, fold in self.literals if fold]
+        self.refold = {field for field in folded if folded.count(field) > 1}
+
+    @classmethod
+    def from_file(cls, path: str) -> 'Categorizer':
+        with open(path) as f:
+            config = json.load(f)
+        return cls(config["rules"], config.get("default", DEFAULT_CATEGORY))
+
+    def match(self, data: Dict) -> Optional[int]:
+        # No match is rule len(assignments), so every comparison is int against int.
+        best = none = len(self.assignments)
+        get = data.get
+        for field, lookup in self.lookups:
+            rule_id = lookup.get(get(field), none)
+            if rule_id < best:
+                best = rule_id
+        lowered = None
+        for rule_id, field, needle, fold in self.literals:
+            if rule_id >= best:
+                break
+            text = get(field) or ""
+            if fold:
+                if field in self.refold:
+                    lowered = {} if lowered is None else lowered
+                    text = lowered[field] if field in lowered else lowered.setdefault(field, text.lower())
+                else:
+                    text = text.lower()
+            if needle in text:
+                return rule_id
+        return None if best == none else best
+
+    def categorize(self, data: Dict) -> Dict:
+        rule_id = self.match(data)
+        if rule_id is None:
+            for key, value in self.default:
+                data.setdefault(key, value)
+            return data
+        constants, templates = self.assignments[rule_id]
+        if templates is None:
+            data.update(constants)
+            return data
+        resolved = [(key, template.format_map(data)) for key, template in templates]
+        data.update(constants)
+        data.update(resolved)
+        return data
+
+    def categorize_batch(self, entries: List[Dict]) -> List[Dict]:
+        categorize = self.categorize
+        for data in entries:
+            categorize(data)
+        return entries
+
+# The hand-written chain is faster than any generic table, so only a configured table is compiled.
+CATEGORIZE = Categorizer.from_file(os.environ["BSE_CATEGORY_RULES"]).categorize if os.environ.get("BSE_CATEGORY_RULES") \
+    else categorize_builtin
 
 class Scraper:
     HEADERS = {
@@ -97,20 +221,29 @@ class Scraper:
         'sec-ch-ua': '"Google Chrome";v="135", "Not-A.Brand";v="8", "Chromium";v="135"',
         'sec-ch-ua-mobile': '?0',
     }
+    ATTACHMENT_URL = "https://www.bseindia.com/xml-data/corpfiling/AttachLive/"
 
-    def __init__(self, proxies: Dict = None):
+    def __init__(self, proxies: Dict = None, throttle: Optional[Callable[[], None]] = None,
+                 pool: Optional[proxy_pool.ProxyPool] = None):
         self.proxies = proxies or {}
+        self.throttle = throttle
+        self.pool = pool
         self.base_url = "https://api.bseindia.com/BseIndiaAPI/api/AnnSubCategoryGetData/w"
 
     def make_request(self, url: str, context: str, headers: Dict = None, retries: int = 2) -> Optional[requests.Response]:
         for _ in range(retries):
+            if self.throttle:
+                self.throttle()
             try:
-                response = requests.get(
-                    url,
-                    headers=headers or self.HEADERS,
-                    proxies=self.proxies,
-                    timeout=100
-                )
+                with proxy_pool.route(self.proxies, self.pool) as route:
+                    response = requests.get(
+                        url,
+                        headers=headers or self.HEADERS,
+                        proxies=route.proxies,
+                        timeout=100
+                    )
+                    if response.status_code in proxy_pool.THROTTLED_STATUSES:
+                        route.fail()
                 if response.status_code == 200:
                     return response
                 print(f"Retrying {url}")
@@ -121,53 +254,88 @@ class Scraper:
         print(f"Failed to get {url} after {retries} retries")
         return None
 
-    def get_pagination(self) -> int:
-        current_date = datetime.now().strftime('%Y%m%d')
-        url = f"{self.base_url}?pageno=1&strCat=-1&strPrevDate={current_date}&strScrip=&strSearch=P&strToDate={current_date}&strType=C&subcategory=-1"
-        response = self.make_request(url, "Pagination")
-        return int(response.json()['Table'][0]['TotalPageCnt']) if response else 1
-
-    def scrape_page(self, page: int, existing_attachments: List[str]) -> List[Dict]:
-        print(f"Getting page {page}") 
-        current_date = datetime.now().strftime('%Y%m%d')
-        url = f"{self.base_url}?pageno={page}&strCat=-1&strPrevDate={current_date}&strScrip=&strSearch=P&strToDate={current_date}&strType=C&subcategory=-1"
-        response = self.make_request(url, "ScrapePage")
+    def page_url(self, page: int, day: Optional[date] = None) -> str:
+        current_date = (day or datetime.now()).strftime('%Y%m%d')
+        return f"{self.base_url}?pageno={page}&strCat=-1&strPrevDate={current_date}&strScrip=&strSearch=P&strToDate={current_date}&strType=C&subcategory=-1"
+
+    def fetch_rows(self, page: int, day: Optional[date] = None) -> Optional[List[Dict]]:
+        """Raw announcement rows of one page, or None if it couldn't be fetched."""
+        print(f"Getting page {page}" + (f" of {day}" if day else "")) 
+        with tracing.span("page_fetch"):
+            response = self.make_request(self.page_url(page, day), "ScrapePage")
+        return serialization.loads(response.content).get('Table', []) if response else None
+
+    def get_pagination(self, day: Optional[date] = None, default: Optional[int] = 1) -> Optional[int]:
+        """Page count for the day, 0 when it has no announcements, ``default`` if the request fails."""
+        with tracing.span("pagination"):
+            response = self.make_request(self.page_url(1, day), "Pagination")
         if not response:
-            return []
+            return default
+        table = serialization.loads(response.content)['Table']
+        return int(table[0]['TotalPageCnt']) if table else 0
+
+    def iter_page(self, page: int, existing_attachments, day: Optional[date] = None) -> Iterator[Optional[Announcement]]:
+        """Yields None once the page is fetched, then each entry not (yet) in ``existing_attachments``."""
+        with tracing.span("page", page=page) as span:
+            rows = self.fetch_rows(page, day)
+            if rows is None:
+                return
+            yield None
 
-        entries = []
-        for entry in response.json().get('Table', []):
-            news_id = entry['NEWSID']
-            if news_id in existing_attachments:
-                continue
+            span.count(rows=len(rows))
+            for entry in rows:
+                news_id = entry['NEWSID']
+                if news_id in existing_attachments:
+                    continue
 
-            if parsed := Parser.parse_entry(entry, self):
-                entries.append(parsed)
-        return entries
+                if parsed := Parser.parse_entry(entry, self):
+                    span.count(parsed=1)
+                    yield parsed
+
+    def scrape_page(self, page: int, existing_attachments: List[str], day: Optional[date] = None) -> List[Announcement]:
+        return [entry for entry in self.iter_page(page, existing_attachments, day) if entry is not None]
+
+    def iter_entries(self, existing_attachments, pagination: bool = False, day: Optional[date] = None) -> Iterator[Announcement]:
+        """Every new entry of page 1, or of all pages, yielded as soon as it's parsed."""
+        max_pages = self.get_pagination(day) if pagination else 1
+        for page in range(1, min(max_pages, 70) + 1):
+            for entry in self.iter_page(page, existing_attachments, day):
+                if entry is not None:
+                    yield entry
 
-    def scrape_job(self, existing_attachments: List[str], pagination: bool = False) -> List[Dict]:
-        max_pages = self.get_pagination() if pagination else 1
-        return [
-            entry
-            for page in range(1, min(max_pages, 70) + 1)
-            for entry in self.scrape_page(page, existing_attachments)
-        ]
+    def scrape_job(self, existing_attachments: List[str], pagination: bool = False) -> List[Announcement]:
+        return list(self.iter_entries(existing_attachments, pagination))
+
+FRESH_NEWS, SWEEP_NEWS = "fresh", "sweep"  # coordinator lanes for page-1 and sweep announcements
 
 class ScraperScheduler:
-    def __init__(self, scraper: Scraper, get_existing_url: str, upload_data_url: str):
+    NEWS_BATCH = 5  # announcements claimed, converted and uploaded together in coordinated mode
+    SWEEP_SECONDS = 1800
+    SEED_POLL_SECONDS = 0.1  # coordinated mode: wait between checks on another node's page count
+
+    def __init__(self, scraper: Scraper, get_existing_url: str, upload_data_url: str,
+                 coordinator: Optional[coordinator.Coordinator] = None):
         self.scraper = scraper
+        self.coordinator = coordinator
         self.last_paginated_run = time.time()
+        self.last_sweep_slot = self._sweep_slot()
         self.get_existing_url = get_existing_url
         self.upload_data_url = upload_data_url
-
-    def _get_existing_attachments(self, retries: int = 3, retry_delay: int = 5) -> List[str]:
-        current_date_str = datetime.now().strftime('%Y-%m-%d')
+        self.queue = WorkQueue()
+        self.latency = LatencyTracker()
+        # News IDs already uploaded or being worked on today, shared by both lanes.
+        self._known_ids: Set[str] = set()
+        self._known_date = None
+
+    def _get_existing_attachments(self, retries: int = 3, retry_delay: int = 5, day: Optional[date] = None) -> List[str]:
+        current_date_str = (day or datetime.now()).strftime('%Y-%m-%d')
         for attempt in range(retries):
             try:
-                response = requests.post(self.get_existing_url, json={"date": current_date_str})
-                response.raise_for_status()
+                with tracing.span("existing_ids_fetch", attempt=attempt + 1):
+                    response = requests.post(self.get_existing_url, json={"date": current_date_str})
+                    response.raise_for_status()
                 print(f"Successfully fetched existing attachments on attempt {attempt + 1}.")
-                return response.json().get('newsIds', [])
+                return serialization.loads(response.content).get('newsIds', [])
             except Exception as e:
                 print(f"Attempt {attempt + 1} failed to fetch existing attachments: {e}")
                 if attempt < retries - 1:
@@ -175,77 +343,217 @@ class ScraperScheduler:
         print(f"Failed to fetch existing attachments after {retries} attempts.")
         return []
 
-    def _upload_data(self, data: List[Dict], retries: int = 3, retry_delay: int = 5) -> None:
-        if not data:
+    def _upload_data(self, data: List[Announcement], retries: int = 3, retry_delay: int = 5) -> bool:
+        return self._upload_bodies([webhook.encode(entry) for entry in data], retries, retry_delay)
+
+    def _upload_bodies(self, bodies: List[bytes], retries: int = 3, retry_delay: int = 5) -> bool:
+        if not bodies:
             print("No new entries to upload.")
-            return
+            return True
 
+        body, headers = webhook.body(bodies)
         for attempt in range(retries):
             try:
-                response = requests.post(self.upload_data_url, json=data)
-                response.raise_for_status()
-                print(f"Successfully uploaded {len(data)} entries on attempt {attempt + 1}.")
-                return
+                with tracing.span("upload", entries=len(bodies), attempt=attempt + 1):
+                    response = requests.post(self.upload_data_url, data=body, headers=headers)
+                    response.raise_for_status()
+                print(f"Successfully uploaded {len(bodies)} entries on attempt {attempt + 1}.")
+                return True
             except Exception as e:
                 print(f"Attempt {attempt + 1} failed to upload data : {e}")
                 if attempt < retries - 1:
                     time.sleep(retry_delay)
         print(f"Failed to upload data after {retries} attempts.")
+        return False
 
+    def _refresh_known_ids(self) -> None:
+        current_date_str = datetime.now().strftime('%Y-%m-%d')
+        if self._known_date != current_date_str:
+            self._known_ids.clear()
+            self._known_date = current_date_str
+            if self.coordinator:
+                self.coordinator.prune()
+        existing = self._get_existing_attachments()
+        print(f"Existing attachments: {len(existing)}")
+        self._known_ids.update(existing)
+
+    def _finish_uploads(self, buffer: UploadBuffer) -> None:
+        buffer.flush()
+        # Let a later run pick up whatever didn't make it.
+        self._known_ids.difference_update(buffer.failed_ids)
+        if buffer.uploaded:
+            print(f"Publish-to-upload latency: {self.latency.summary()}")
+
+    def _page_job(self, page: int, buffer: Optional[UploadBuffer] = None) -> Iterator[bool]:
+        """Streams the page's new entries into ``buffer``, or into its own one flushed at the end."""
+        own_buffer = buffer is None
+        buffer = buffer or UploadBuffer(self._upload_bodies, self.latency)
+        try:
+            for entry in self.scraper.iter_page(page, self._known_ids):
+                if entry is None:
+                    yield True
+                    continue
+                self._known_ids.add(entry.NEWS_ID)
+                buffer.add(entry)
+                yield entry.ATTACHMENT is not None
+        finally:
+            if own_buffer:
+                self._finish_uploads(buffer)
+
+    def _shard_page(self, page: int) -> Iterator[bool]:
+        """Coordinated mode: queue the page's new announcements in the fresh or sweep news lane."""
+        rows = self.scraper.fetch_rows(page)
+        yield True
+        if rows is None:
+            return False
+        added = self.coordinator.add(
+            ((f"news:{row['NEWSID']}", row) for row in rows if row['NEWSID'] not in self._known_ids),
+            lane=FRESH_NEWS if page == 1 else SWEEP_NEWS)
+        print(f"Page {page}: {added} new announcements queued")
+        return True
+
+    def _claimed_news_job(self, lane: str) -> Iterator[bool]:
+        """Coordinated mode: convert and upload the lane's queued announcements until none are left."""
+        while claimed := self.coordinator.claim("news:", self.NEWS_BATCH, lane=lane):
+            keys, entries = [key for key, _ in claimed], {}
+            for key, row in claimed:
+                if key not in keys:
+                    continue
+                if parsed := Parser.parse_entry(row, self.scraper):
+                    entries[key] = parsed
+                yield bool(row.get("ATTACHMENTNAME"))
+                # A step can wait behind other work past the lease; leave taken-over announcements alone.
+                keys = self.coordinator.renew(keys)
+            uploads = [entries[key] for key in keys if key in entries]
+            if not self._upload_data(uploads):
+                # Not the announcements' fault: keep them queued for the next tick, however long the outage.
+                self.coordinator.release(keys, count_attempt=False)
+                return
+            self.coordinator.complete(keys)
+            self._known_ids.update(entry.NEWS_ID for entry in uploads)
+            self.latency.record(entry.BROADCAST_DATE_TIME for entry in uploads)
+
+    def _fresh_job(self) -> Iterator[bool]:
+        self._refresh_known_ids()
+        yield False
+        if self.coordinator:
+            yield from self._shard_page(1)
+            yield from self._claimed_news_job(FRESH_NEWS)
+        else:
+            yield from self._page_job(1)
+
+    def _sweep_job(self) -> Iterator[bool]:
+        self._refresh_known_ids()
+        yield False
+        if self.coordinator:
+            yield from self._coordinated_sweep()
+            return
+        max_pages = self.scraper.get_pagination()
+        yield True
+        # Page 1 belongs to the fresh lane, which polls it on every tick.
+        buffer = UploadBuffer(self._upload_bodies, self.latency)
+        try:
+            for page in range(2, min(max_pages, 70) + 1):
+                yield from self._page_job(page, buffer)
+        finally:
+            self._finish_uploads(buffer)
+
+    def _sweep_slot(self) -> int:
+        return int(time.time() // self.SWEEP_SECONDS)
+
+    def _sweep_due(self) -> bool:
+        # Coordinated nodes sweep on wall-clock slots so they all land in the same one.
+        if self.coordinator:
+            return self._sweep_slot() != self.last_sweep_slot
+        return time.time() - self.last_paginated_run >= self.SWEEP_SECONDS
+
+    def _coordinated_sweep(self) -> Iterator[bool]:
+        """One sweep per slot across all nodes: the first to claim it queues the pages, then all share them."""
+        slot = f"sweep:{self._sweep_slot()}"
+        seed_key = f"{slot}:pages"
+        self.coordinator.add([(seed_key, None)])
+        while True:
+            if seed := self.coordinator.claim(seed_key):
+                max_pages = self.scraper.get_pagination()
+                yield True
+                self.coordinator.add((f"{slot}:page:{page:02d}", None) for page in range(2, min(max_pages, 70) + 1))
+                self.coordinator.complete(key for key, _ in seed)
+                break
+            if not self.coordinator.leased(seed_key):
+                break
+            # Another node is reading the page count; its page jobs are about to appear.
+            time.sleep(self.SEED_POLL_SECONDS)
+            yield False
+        yield from self._sweep_pages(slot)
+        yield from self._claimed_news_job(SWEEP_NEWS)
+
+    def _sweep_pages(self, slot: str) -> Iterator[bool]:
+        while claimed := self.coordinator.claim(f"{slot}:page:"):
+            key = claimed[0][0]
+            if (yield from self._shard_page(int(key.rsplit(":", 1)[1]))):
+                self.coordinator.complete([key])
+            else:
+                self.coordinator.release([key])
+
+    def _sweep_help_job(self) -> Iterator[bool]:
+        """Coordinated mode, every tick: take the current slot's leftover sweep pages and queued sweep announcements."""
+        yield from self._sweep_pages(f"sweep:{self._sweep_slot()}")
+        yield from self._claimed_news_job(SWEEP_NEWS)
 
     def _run_interval(self, pagination: bool) -> bool:
+        """Run page 1, plus the paginated sweep if asked, to completion on the calling thread."""
         try:
-            existing = self._get_existing_attachments()
-            print(f"Existing attachments: {len(existing)}")
-            data = self.scraper.scrape_job(existing, pagination)
-            self._upload_data(data)
+            with tracing.cycle("announcements_paginated" if pagination else "announcements"):
+                failures = self.queue.failures
+                self.queue.submit(FRESH, self._fresh_job(), tracing.start_trace("fresh"))
+                if pagination:
+                    self.queue.submit(BACKFILL, self._sweep_job(), tracing.start_trace("sweep"))
+                self.queue.drain()
             print("-" * 100)
-            return True
+            return self.queue.failures == failures
         except Exception as e:
             print(f"Run interval failed: {e}")
             print("-" * 100)
             return False
 
-
     def start(self):
-        def job_loop():
-            while True:
-                print("2 minutes run")
-                # Run every 2 minutes without pagination
-                success_2min = self._run_interval(False)
-                if not success_2min:
-                    print("2 minutes run failed, will retry next interval.")
-
-                time.sleep(120)
-
-                # Run every 30 minutes with pagination
-                if time.time() - self.last_paginated_run >= 1800:
-                    print("30 minutes run")
-                    success_30min = self._run_interval(True)
-                    if success_30min:
-                        self.last_paginated_run = time.time()
-                    else:
-                        print("30 minutes run failed, will retry next interval.")
-
-        thread = threading.Thread(target=job_loop, daemon=True)
-        thread.start()
-        thread.join()
+        worker = threading.Thread(target=self.queue.run_forever, daemon=True)
+        worker.start()
+        while True:
+            # Never stack a second page-1 run behind one that is still going.
+            if not self.queue.pending(FRESH):
+                print(f"Page 1 run ({market_calendar.phase()})")
+                self.queue.submit(FRESH, self._fresh_job(), tracing.start_trace("announcements"))
+
+            # Paginated sweep every 30 minutes, in the backfill lane
+            if self._sweep_due() and not self.queue.pending(BACKFILL):
+                print("30 minutes run")
+                if pool := self.scraper.pool or proxy_pool.POOL:
+                    print(f"Proxy pool: {pool.summary()}")
+                self.queue.submit(BACKFILL, self._sweep_job(), tracing.start_trace("announcements_paginated"))
+                self.last_paginated_run = time.time()
+                self.last_sweep_slot = self._sweep_slot()
+            elif self.coordinator and not self.queue.pending(BACKFILL):
+                # Sweep announcements queued by other nodes are drained by every node, sweeping or not.
+                self.queue.submit(BACKFILL, self._sweep_help_job())
+
+            time.sleep(market_calendar.poll_interval("announcements"))
+
+# Configuration
+PROXIES = {
+    "http": "",
+    "https": "",
+}
+GET_EXISTING_URL = "https://dummy.online/check" # Dummy URL for getting existing attachments
+UPLOAD_DATA_URL = "https://duplicate.whalesbook.online/check" # Dummy URL for uploading data
 
 def main():
-    # Configuration
-    PROXIES = {
-        "http": "",
-        "https": "",
-    }
-    GET_EXISTING_URL = "https://dummy.online/check" # Dummy URL for getting existing attachments
-    UPLOAD_DATA_URL = "https://duplicate.whalesbook.online/check" # Dummy URL for uploading data
-
-
     # Initialize components
     scraper = Scraper(proxies=PROXIES)
-    scheduler = ScraperScheduler(scraper, GET_EXISTING_URL, UPLOAD_DATA_URL)
+    scheduler = ScraperScheduler(scraper, GET_EXISTING_URL, UPLOAD_DATA_URL, coordinator=coordinator.from_env())
 
     # Start scraping process
+    report_startup("Announcements Service")
     scheduler.start()
 
 
@@ -0,0 +1,196 @@
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+import tracing
+from announcements import GET_EXISTING_URL, PROXIES, UPLOAD_DATA_URL, Scraper, ScraperScheduler
+from lazy import report_startup
+from upload_buffer import UploadBuffer
+from work_queue import BACKFILL_SHARE, REQUEST_BUDGET_PER_MINUTE
+
+MAX_PAGES = 70  # same cap as the live sweep
+REQUESTS_PER_MINUTE = REQUEST_BUDGET_PER_MINUTE * BACKFILL_SHARE or 60
+
+
+class RateLimiter:
+    """Spaces requests evenly so all workers together stay under ``per_minute``."""
+
+    def __init__(self, per_minute: float):
+        self.interval = 60 / per_minute
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+class Checkpoint:
+    """Page count and finished pages per day, saved after every page so a rerun resumes."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path) as f:
+                self.days: Dict[str, Dict] = json.load(f)["days"]
+        except FileNotFoundError:
+            self.days = {}
+        except json.JSONDecodeError:
+            print(f"Checkpoint {path} is unreadable, starting fresh")
+            self.days = {}
+
+    def _day(self, day: date) -> Dict:
+        return self.days.setdefault(day.isoformat(), {"pages": None, "done": []})
+
+    def pages(self, day: date) -> Optional[int]:
+        with self._lock:
+            return self._day(day)["pages"]
+
+    def done(self, day: date) -> Set[int]:
+        with self._lock:
+            return set(self._day(day)["done"])
+
+    def set_pages(self, day: date, pages: int) -> None:
+        with self._lock:
+            self._day(day)["pages"] = pages
+            self._save()
+
+    def mark_done(self, day: date, page: int) -> None:
+        with self._lock:
+            self._day(day)["done"] = sorted(set(self._day(day)["done"]) | {page})
+            self._save()
+
+    def _save(self) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"days": self.days}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+class Backfill:
+    """Re-scrapes past days through the live pipeline, sharded by (day, page) across a thread pool."""
+
+    def __init__(self, scheduler: ScraperScheduler, checkpoint: Checkpoint, workers: int):
+        self.scheduler = scheduler
+        self.scraper = scheduler.scraper
+        self.checkpoint = checkpoint
+        self.workers = workers
+        self._known: Dict[date, Set[str]] = {}
+        self._day_locks: Dict[date, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _known_ids(self, day: date) -> Set[str]:
+        # The fetch retries with sleeps, so only workers on the same day wait for it.
+        with self._lock:
+            day_lock = self._day_locks.setdefault(day, threading.Lock())
+        with day_lock:
+            with self._lock:
+                if day in self._known:
+                    return self._known[day]
+            known = set(self.scheduler._get_existing_attachments(day=day))
+            print(f"{day}: {len(known)} existing announcements")
+            with self._lock:
+                self._known[day] = known
+            return known
+
+    def _page_count(self, day: date) -> int:
+        pages = self.checkpoint.pages(day)
+        if pages is None:
+            pages = self.scraper.get_pagination(day, default=None)
+            if pages is None:
+                raise RuntimeError("pagination request failed")
+            pages = min(pages, MAX_PAGES)
+            self.checkpoint.set_pages(day, pages)
+        return pages
+
+    def _page(self, day: date, page: int) -> int:
+        known = self._known_ids(day)
+        with tracing.cycle(f"backfill_{day}", page=page):
+            fetched, buffer = False, UploadBuffer(self.scheduler._upload_bodies)
+            for entry in self.scraper.iter_page(page, known, day):
+                if entry is None:
+                    fetched = True
+                    continue
+                with self._lock:
+                    if entry.NEWS_ID in known:
+                        continue
+                    known.add(entry.NEWS_ID)
+                buffer.add(entry)
+            buffer.flush()
+            if buffer.failed_ids:
+                with self._lock:
+                    known.difference_update(buffer.failed_ids)
+                raise RuntimeError(f"upload of {len(buffer.failed_ids)} entries failed")
+            if not fetched:
+                raise RuntimeError("page fetch failed")
+        self.checkpoint.mark_done(day, page)
+        return buffer.uploaded
+
+    def run(self, days: List[date]) -> Tuple[int, int]:
+        """Returns (uploaded entries, failed pages or days); failures are retried by the next run."""
+        uploaded, failed = 0, 0
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            counts = {pool.submit(self._page_count, day): day for day in days}
+            shards = []
+            for future in as_completed(counts):
+                day = counts[future]
+                try:
+                    pages = future.result()
+                except Exception as e:
+                    failed += 1
+                    print(f"Backfill of {day} failed: {e}")
+                    continue
+                done = self.checkpoint.done(day)
+                shards.extend((day, page) for page in range(1, pages + 1) if page not in done)
+            print(f"{len(shards)} pages to backfill across {len(days)} days")
+
+            futures = {pool.submit(self._page, day, page): (day, page) for day, page in sorted(shards)}
+            for future in as_completed(futures):
+                day, page = futures[future]
+                try:
+                    uploaded += future.result()
+                except Exception as e:
+                    failed += 1
+                    print(f"Backfill of {day} page {page} failed: {e}")
+        return uploaded, failed
+
+
+def date_range(start: date, end: date) -> List[date]:
+    return [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+
+def main():
+    parse_date = lambda value: datetime.strptime(value, "%Y-%m-%d").date()
+    parser = argparse.ArgumentParser(description="Backfill announcements for past days.")
+    parser.add_argument("--start", type=parse_date, required=True, help="First day, YYYY-MM-DD")
+    parser.add_argument("--end", type=parse_date, help="Last day, inclusive (default: --start)")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--checkpoint", default="backfill_checkpoint.json")
+    parser.add_argument("--requests-per-minute", type=float, default=REQUESTS_PER_MINUTE,
+                        help="BSE request budget shared by all workers, PDFs included")
+    args = parser.parse_args()
+    if args.end and args.end < args.start:
+        parser.error("--end must not be before --start")
+
+    days = date_range(args.start, args.end or args.start)
+    scraper = Scraper(proxies=PROXIES, throttle=RateLimiter(args.requests_per_minute))
+    backfill = Backfill(ScraperScheduler(scraper, GET_EXISTING_URL, UPLOAD_DATA_URL),
+                        Checkpoint(args.checkpoint), args.workers)
+    report_startup("Announcements Backfill")
+    uploaded, failed = backfill.run(days)
+    print(f"Backfilled {uploaded} announcements from {days[0]} to {days[-1]}, {failed} pages or days failed"
+          + (f"; rerun to retry them from {args.checkpoint}" if failed else ""))
+
+
+if __name__ == '__main__':
+    main()
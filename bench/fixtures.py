@@ -0,0 +1,88 @@
+import json
+import os
+from typing import Dict, List, Optional
+
+MANIFEST = "manifest.json"
+
+# Paths the stub server exposes, mirroring the live BSE endpoints each scraper talks to.
+ANNOUNCEMENTS_PATH = "/BseIndiaAPI/api/AnnSubCategoryGetData/w"
+ATTACHMENT_PATH = "/xml-data/corpfiling/AttachLive/"
+HIGH_LOW_PATH = "/BseIndiaAPI/api/HLDownloadCSVNew/w"
+VOLUME_PATH = "/BseIndiaAPI/api/SpurtvolumeNew/w"
+INSIDER_PATH = "/corporates/Insider_Trading_new.aspx"
+EXISTING_IDS_PATH = "/check"
+
+
+class FixtureSet:
+    """A directory of recorded (or synthesized) responses plus a manifest of routes.
+
+    Each route matches on method and path, and on a subset of query parameters so
+    date-dependent parameters such as ``strPrevDate`` never have to line up. A
+    ``prefix`` route serves one of its ``files`` (picked by path) for anything below it, which
+    is how a handful of sample PDFs stand in for every attachment of a sweep.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = os.path.abspath(directory)
+        self.routes: List[Dict] = []
+
+    @classmethod
+    def load(cls, directory: str) -> 'FixtureSet':
+        fixtures = cls(directory)
+        with open(os.path.join(directory, MANIFEST)) as f:
+            fixtures.routes = json.load(f)["routes"]
+        return fixtures
+
+    def add(self, method: str, path: str, name: str, body: bytes, content_type: str,
+            query: Optional[Dict[str, str]] = None) -> None:
+        self._write(name, body)
+        self.routes.append({
+            "method": method,
+            "path": path,
+            "query": query or {},
+            "file": name,
+            "content_type": content_type,
+        })
+
+    def add_prefix(self, method: str, path: str, files: Dict[str, bytes], content_type: str) -> None:
+        for name, body in files.items():
+            self._write(name, body)
+        self.routes.append({
+            "method": method,
+            "path": path,
+            "prefix": True,
+            "files": list(files),
+            "content_type": content_type,
+        })
+
+    def save(self) -> None:
+        with open(os.path.join(self.directory, MANIFEST), 'w') as f:
+            json.dump({"routes": self.routes}, f, indent=2)
+
+    def match(self, method: str, path: str, query: Dict[str, str]) -> Optional[Dict]:
+        best, best_score = None, -1
+        for route in self.routes:
+            if route["method"] != method:
+                continue
+            if route.get("prefix"):
+                if not path.startswith(route["path"]):
+                    continue
+                score = 0
+            else:
+                if route["path"] != path or any(query.get(k) != v for k, v in route["query"].items()):
+                    continue
+                score = len(route["query"]) + 1
+            if score > best_score:
+                best, best_score = route, score
+        return best
+
+    def body(self, route: Dict, path: str) -> bytes:
+        name = route["file"] if not route.get("prefix") else \
+            route["files"][sum(path.encode()) % len(route["files"])]
+        with open(os.path.join(self.directory, name), 'rb') as f:
+            return f.read()
+
+    def _write(self, name: str, body: bytes) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, name), 'wb') as f:
+            f.write(body)
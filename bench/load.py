@@ -0,0 +1,71 @@
+import argparse
+import glob
+import json
+import os
+import tempfile
+import tracemalloc
+from typing import Dict, List
+
+from bench import run, synth
+from bench.stub_server import StubServer
+
+
+def _output_bytes(workdir: str) -> int:
+    return sum(os.path.getsize(path) for path in glob.glob(os.path.join(workdir, "*.json")))
+
+
+def measure(script: str, server: StubServer, iterations: int, verbose: bool) -> Dict:
+    """Timing pass first, then one tracemalloc pass so allocation tracking doesn't skew latencies."""
+    sizes = []
+    result = run.benchmark(script, server, iterations, verbose, on_iteration=lambda d: sizes.append(_output_bytes(d)))
+    tracemalloc.start()
+    try:
+        run.benchmark(script, server, 1, verbose)
+        result["peak_mb"] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        tracemalloc.stop()
+    result["output_kb"] = max(sizes) / 1024 if sizes else 0.0
+    return result
+
+
+def print_report(rows: List[Dict]) -> None:
+    print(f"{'script':<16}{'scale':>7}{'p50 s':>9}{'ms/item':>9}{'items':>8}{'peak MB':>9}{'file KB':>10}{'upload KB':>11}")
+    baseline: Dict[str, float] = {}
+    for r in rows:
+        per_item = r["p50_s"] * 1000 / r["uploaded_items"] if r["uploaded_items"] else 0.0
+        # Per-item cost climbing with scale is the knee: work that should be linear isn't.
+        growth = f"  x{per_item / baseline[r['script']]:.2f}" if baseline.get(r["script"]) else ""
+        baseline.setdefault(r["script"], per_item)
+        print(f"{r['script']:<16}{r['scale']:>7g}{r['p50_s']:>9.3f}{per_item:>9.2f}{r['uploaded_items']:>8}"
+              f"{r['peak_mb']:>9.1f}{r['output_kb']:>10.1f}{r['upload_bytes'] / 1024:>11.1f}{growth}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure how each script's cycle scales with synthetic peak-day volume.")
+    parser.add_argument("--scales", nargs="+", type=float, default=[1, 2, 5, 10])
+    parser.add_argument("--scripts", nargs="+", choices=run.SCRIPTS, default=list(run.SCRIPTS))
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--pdf-pages", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated upstream latency per request (s)")
+    parser.add_argument("--json", help="Also write results to this file")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+    if args.iterations < 1:
+        parser.error("--iterations must be at least 1")
+
+    rows = []
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory() as directory:
+            fixtures = synth.generate(directory, scale, pdf_pages=args.pdf_pages)
+            with StubServer(fixtures, latency=args.latency) as server:
+                for script in args.scripts:
+                    rows.append({**measure(script, server, args.iterations, args.verbose), "scale": scale})
+    rows.sort(key=lambda r: (r["script"], r["scale"]))
+    print_report(rows)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import argparse
+import os
+import tempfile
+import threading
+import time
+from unittest import mock
+
+from bench import fixtures as fx
+from bench import synth
+from bench.fixtures import FixtureSet
+from bench.run import quiet
+from bench.stub_server import StubServer
+
+
+def sweep(server: StubServer, nodes: int, verbose: bool) -> dict:
+    """One paginated cycle run by ``nodes`` schedulers at once, sharing a fresh coordinator database."""
+    import announcements
+    from coordinator import Coordinator
+
+    server.receiver.reset()
+    served_before = server.served
+    with tempfile.TemporaryDirectory() as workdir, \
+            mock.patch.object(announcements.Scraper, "ATTACHMENT_URL", server.url + fx.ATTACHMENT_PATH):
+        db_path = os.path.join(workdir, "coordinator.db")
+        schedulers = []
+        for node in range(nodes):
+            scraper = announcements.Scraper()
+            scraper.base_url = server.url + fx.ANNOUNCEMENTS_PATH
+            schedulers.append(announcements.ScraperScheduler(
+                scraper, server.url + fx.EXISTING_IDS_PATH, f"{server.url}/webhook/announcements",
+                coordinator=Coordinator(db_path, node_id=f"node{node}")))
+        threads = [threading.Thread(target=scheduler._run_interval, args=(True,)) for scheduler in schedulers]
+        with quiet(not verbose):
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - start
+        counts = schedulers[0].coordinator.counts("news:")
+    return {"nodes": nodes, "seconds": elapsed, "uploaded": server.receiver.totals()["items"],
+            "upstream": server.served - served_before, "failed": counts.get("failed", 0)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Paginated announcement sweep split across N coordinated nodes.")
+    parser.add_argument("--fixtures", help="Fixture set to serve (default: synthesize one)")
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--latency", type=float, default=0.2, help="Simulated upstream latency per request (s)")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    fixtures = args.fixtures
+    if not fixtures:
+        fixtures = "bench/fixtures_synthetic"
+        synth.generate(fixtures)
+    # Every node is one thread here, so this measures how well the work splits, not CPU scaling.
+    with StubServer(FixtureSet.load(fixtures), latency=args.latency) as server:
+        results = [sweep(server, nodes, args.verbose) for nodes in args.nodes]
+    base = results[0]["seconds"]
+    print(f"{'nodes':>5}{'seconds':>10}{'speedup':>9}{'uploaded':>10}{'upstream':>10}{'failed':>8}")
+    for r in results:
+        print(f"{r['nodes']:>5}{r['seconds']:>10.2f}{base / r['seconds']:>8.1f}x{r['uploaded']:>10}{r['upstream']:>10}{r['failed']:>8}")
+
+
+if __name__ == "__main__":
+    main()
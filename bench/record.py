@@ -0,0 +1,107 @@
+import argparse
+import json
+from datetime import datetime
+from typing import Dict
+
+from curl_cffi import requests
+
+import proxy_pool
+from announcements import Scraper
+from bench import fixtures as fx
+from bench.fixtures import FixtureSet
+from insider_trading import InsiderTradingScraper
+from low_high import BSEScraper
+from volume import VolumeScraper
+
+
+def record_announcements(fixtures: FixtureSet, pages: int, pdfs: int) -> None:
+    scraper = Scraper()
+    current_date = datetime.now().strftime('%Y%m%d')
+    attachments = []
+    recorded = []
+    for page in range(1, pages + 1):
+        url = f"{scraper.base_url}?pageno={page}&strCat=-1&strPrevDate={current_date}&strScrip=&strSearch=P&strToDate={current_date}&strType=C&subcategory=-1"
+        response = scraper.make_request(url, "Record")
+        if not response:
+            break
+        payload = response.json()
+        if not payload.get('Table'):
+            break
+        recorded.append(payload)
+        attachments.extend(row['ATTACHMENTNAME'] for row in payload['Table'] if row.get('ATTACHMENTNAME'))
+
+    # The stub only knows the recorded pages, so make pagination agree with it.
+    for page, payload in enumerate(recorded, 1):
+        for row in payload['Table']:
+            row['TotalPageCnt'] = len(recorded)
+        fixtures.add("GET", fx.ANNOUNCEMENTS_PATH, f"announcements_page_{page}.json",
+                     json.dumps(payload).encode(), "application/json", {"pageno": str(page)})
+
+    samples: Dict[str, bytes] = {}
+    for name in attachments[:pdfs]:
+        response = scraper.make_request(f"{scraper.ATTACHMENT_URL}{name}", "Record")
+        if response:
+            samples[f"attachment_{len(samples)}.pdf"] = response.content
+    if samples:
+        fixtures.add_prefix("GET", fx.ATTACHMENT_PATH, samples, "application/pdf")
+    fixtures.add("POST", fx.EXISTING_IDS_PATH, "existing_ids.json", b'{"newsIds": []}', "application/json")
+    print(f"Recorded {len(recorded)} announcement pages and {len(samples)} PDFs")
+
+
+def record_high_low(fixtures: FixtureSet) -> None:
+    scraper = BSEScraper()
+    for flag in ('H', 'L'):
+        params = {**scraper.base_params, 'HLflag': flag}
+        response = requests.get(scraper.BASE_URL, headers=scraper.HEADERS, params=params, timeout=30)
+        response.raise_for_status()
+        fixtures.add("GET", fx.HIGH_LOW_PATH, f"52week_{flag}.csv", response.content, "text/csv", {"HLflag": flag})
+    print("Recorded 52-week High/Low CSVs")
+
+
+def record_volume(fixtures: FixtureSet) -> None:
+    scraper = VolumeScraper()
+    response = scraper._make_request('GET', scraper.BASE_URL)
+    if response:
+        fixtures.add("GET", fx.VOLUME_PATH, "spurt_volume.json", response.content, "application/json", {"flag": "1"})
+        print("Recorded spurt volume JSON")
+
+
+def record_insider_trading(fixtures: FixtureSet) -> None:
+    scraper = InsiderTradingScraper()
+    session = scraper._create_session()
+    with proxy_pool.route(scraper.proxies, scraper.pool) as route:
+        page = scraper._make_request(session=session, route=route, method='GET', url=scraper.BASE_URL,
+                                     headers=scraper.HEADERS)
+        if not page:
+            return
+        csv_response = scraper._make_request(
+            session=session, route=route, method='POST', url=scraper.BASE_URL,
+            data=scraper._get_request_data(page.text),
+            headers={**scraper.HEADERS, 'Referer': scraper.BASE_URL},
+            cookies=page.cookies
+        )
+    if not csv_response:
+        return
+    fixtures.add("GET", fx.INSIDER_PATH, "insider_trading.html", page.content, "text/html")
+    fixtures.add("POST", fx.INSIDER_PATH, "insider_trading.csv", csv_response.content, "text/csv")
+    print("Recorded insider trading page and CSV")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record live BSE responses into a replayable fixture set.")
+    parser.add_argument("--out", default="bench/fixtures")
+    parser.add_argument("--pages", type=int, default=3, help="Announcement pages to record")
+    parser.add_argument("--pdfs", type=int, default=5, help="Sample attachment PDFs to record")
+    args = parser.parse_args()
+
+    fixtures = FixtureSet(args.out)
+    record_announcements(fixtures, args.pages, args.pdfs)
+    record_high_low(fixtures)
+    record_volume(fixtures)
+    record_insider_trading(fixtures)
+    fixtures.save()
+    print(f"Saved {len(fixtures.routes)} routes to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
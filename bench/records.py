@@ -0,0 +1,110 @@
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Type
+
+import serialization
+from bench import synth
+from records import InsiderTrade, Record, VolumeRecord, to_dicts
+
+
+def parsed_rows(dataset: str, rows: int, seed: int) -> List[Record]:
+    """A day's rows parsed by the scraper itself from synthetic BSE payloads."""
+    rng = random.Random(seed)
+    if dataset == "volume":
+        from volume import VolumeScraper
+        return VolumeScraper()._process_data(json.loads(synth.volume_json(rng, rows)))
+    from insider_trading import InsiderTradingScraper
+    return InsiderTradingScraper()._process_csv_data(synth.insider_csv(rng, rows).decode())
+
+
+def allocated(build: Callable[[], List]) -> int:
+    """Bytes still held by what ``build`` returns; the field values are shared, so this is per-row overhead."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    rows = build()
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del rows
+    return held
+
+
+def best_of(fn: Callable[[], None], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def compare(dataset: str, record_type: Type[Record], records: List[Record], rounds: int) -> None:
+    stored = to_dicts(records)
+    # Half the day is already on disk; the cycle dedups the full snapshot against it.
+    on_disk = stored[:len(stored) // 2]
+
+    def legacy_cycle():
+        seen = {json.dumps(entry, sort_keys=True) for entry in on_disk}
+        return [entry for entry in stored if json.dumps(entry, sort_keys=True) not in seen]
+
+    def record_cycle(fresh: List[Record]):
+        seen = {record_type.key_of(entry) for entry in on_disk}
+        return [record for record in fresh if record.key not in seen]
+
+    assert len(legacy_cycle()) == len(record_cycle([record_type.from_dict(e) for e in stored]))
+    dict_bytes = allocated(lambda: [dict(entry) for entry in stored])
+    record_bytes = allocated(lambda: [record_type.from_dict(entry) for entry in stored])
+    legacy = best_of(legacy_cycle, rounds)
+    # Keys are cached per record, so every round gets records that haven't encoded theirs yet.
+    batches = [[record_type.from_dict(e) for e in stored] for _ in range(rounds)]
+    fast = best_of(lambda: record_cycle(batches.pop()), rounds)
+
+    # Day-file save with half the day already written: rewrite everything vs splice in new bodies.
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "day.json")
+
+        def legacy_save():
+            with open(path, 'w') as f:
+                json.dump({"entries": on_disk}, f, indent=2, sort_keys=True)
+            with open(path) as f:
+                existing = json.load(f)['entries']
+            with open(path, 'w') as f:
+                json.dump({"entries": existing + stored[len(on_disk):]}, f, indent=2, sort_keys=True)
+
+        def append_save(fresh: List[Record]):
+            serialization.append_entries(path, (serialization.canonical(entry) for entry in on_disk))
+            serialization.append_entries(path, (record.to_json() for record in fresh[len(on_disk):]))
+
+        legacy_write = best_of(legacy_save, rounds)
+        batches = [[record_type.from_dict(e) for e in stored] for _ in range(rounds)]
+        fast_write = best_of(lambda: (os.remove(path), append_save(batches.pop())), rounds)
+
+    n = len(records)
+    print(f"{dataset}: {n} rows, {serialization.BACKEND} JSON backend")
+    print(f"    row containers   dict {dict_bytes / n:>7.0f} B/row   record {record_bytes / n:>7.0f} B/row"
+          f"   ({dict_bytes / 2 ** 20:.1f} -> {record_bytes / 2 ** 20:.1f} MiB)")
+    print(f"    dedup cycle      dict {legacy * 1000:>7.1f} ms       record {fast * 1000:>7.1f} ms"
+          f"       ({legacy / fast:.1f}x)")
+    # Both include writing the first half of the day, which a live cycle has already done.
+    print(f"    day-file save    json {legacy_write * 1000:>7.1f} ms       append {fast_write * 1000:>7.1f} ms"
+          f"       ({legacy_write / fast_write:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-row memory and dedup serialization cost, dicts vs record types.")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    datasets: Dict[str, Type[Record]] = {"volume": VolumeRecord, "insider_trading": InsiderTrade}
+    for dataset, record_type in datasets.items():
+        compare(dataset, record_type, parsed_rows(dataset, args.rows, args.seed), args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import argparse
+import contextlib
+import json
+import os
+import tempfile
+import time
+from typing import Callable, Dict, Iterator, List
+from unittest import mock
+
+from bench import fixtures as fx
+from bench.fixtures import FixtureSet
+from bench.stub_server import StubServer
+
+SCRIPTS = ("announcements", "low_high", "volume", "insider_trading")
+
+
+@contextlib.contextmanager
+def pointed_at(script: str, stub_url: str) -> Iterator[Callable[[], None]]:
+    """Redirect one script's upstream and webhook URLs to the stub and yield its full cycle."""
+    webhook_url = f"{stub_url}/webhook/{script}"
+    with contextlib.ExitStack() as stack:
+        if script == "announcements":
+            import announcements
+            stack.enter_context(mock.patch.object(announcements.Scraper, "ATTACHMENT_URL", stub_url + fx.ATTACHMENT_PATH))
+
+            def cycle():
+                scraper = announcements.Scraper()
+                scraper.base_url = stub_url + fx.ANNOUNCEMENTS_PATH
+                announcements.ScraperScheduler(scraper, stub_url + fx.EXISTING_IDS_PATH, webhook_url)._run_interval(True)
+        elif script == "low_high":
+            import low_high
+            stack.enter_context(mock.patch.object(low_high.BSEScraper, "BASE_URL", stub_url + fx.HIGH_LOW_PATH))
+            stack.enter_context(mock.patch.dict(low_high.WEBHOOK_URLS, {"high": f"{webhook_url}/high", "low": f"{webhook_url}/low"}))
+            stack.enter_context(mock.patch.object(low_high, "is_market_hours", lambda: True))
+            cycle = low_high.fetch_and_save_job
+        elif script == "volume":
+            import volume
+            stack.enter_context(mock.patch.object(volume.VolumeScraper, "BASE_URL", f"{stub_url}{fx.VOLUME_PATH}?flag=1"))
+            stack.enter_context(mock.patch.object(volume, "is_market_hours", lambda: True))
+
+            def cycle():
+                volume.fetch_and_save_job(webhook_url=webhook_url)
+        elif script == "insider_trading":
+            import insider_trading
+            stack.enter_context(mock.patch.object(insider_trading.InsiderTradingScraper, "BASE_URL", stub_url + fx.INSIDER_PATH))
+
+            def cycle():
+                insider_trading.fetch_and_save_job(webhook_url=webhook_url)
+        else:
+            raise ValueError(f"Unknown script: {script}")
+        yield cycle
+
+
+@contextlib.contextmanager
+def quiet(enabled: bool) -> Iterator[None]:
+    if not enabled:
+        yield
+        return
+    try:
+        from loguru import logger
+        logger.remove()
+    except ImportError:
+        pass
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))] if ordered else 0.0
+
+
+def benchmark(script: str, server: StubServer, iterations: int, verbose: bool = False,
+              on_iteration: Callable[[str], None] = None) -> Dict:
+    """Run a script's full cycle against the stub, each iteration in a fresh working directory."""
+    if iterations < 1:
+        raise ValueError("iterations must be at least 1")
+    latencies, items, wire_bytes, upstream = [], 0, 0, 0
+    cwd = os.getcwd()
+    with pointed_at(script, server.url) as cycle:
+        for _ in range(iterations):
+            server.receiver.reset()
+            served_before = server.served
+            with tempfile.TemporaryDirectory() as workdir:
+                os.chdir(workdir)
+                try:
+                    with quiet(not verbose):
+                        start = time.perf_counter()
+                        cycle()
+                        latencies.append(time.perf_counter() - start)
+                    if on_iteration:
+                        on_iteration(workdir)
+                finally:
+                    os.chdir(cwd)
+            totals = server.receiver.totals()
+            items += totals["items"]
+            wire_bytes += totals["bytes"]
+            upstream += server.served - served_before
+    return {
+        "script": script,
+        "iterations": iterations,
+        "upstream_requests": upstream // iterations,
+        "uploaded_items": items // iterations,
+        "upload_bytes": wire_bytes // iterations,
+        "min_s": min(latencies),
+        "p50_s": percentile(latencies, 0.5),
+        "p95_s": percentile(latencies, 0.95),
+        "max_s": max(latencies),
+        "items_per_s": items / sum(latencies) if sum(latencies) else 0.0,
+    }
+
+
+def print_report(results: List[Dict]) -> None:
+    print(f"{'script':<16}{'p50 s':>9}{'p95 s':>9}{'max s':>9}{'items':>8}{'items/s':>10}{'upstream':>10}{'upload B':>11}")
+    for r in results:
+        print(f"{r['script']:<16}{r['p50_s']:>9.3f}{r['p95_s']:>9.3f}{r['max_s']:>9.3f}"
+              f"{r['uploaded_items']:>8}{r['items_per_s']:>10.1f}{r['upstream_requests']:>10}{r['upload_bytes']:>11}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark each script's full cycle offline against recorded fixtures.")
+    parser.add_argument("--fixtures", default="bench/fixtures")
+    parser.add_argument("--scripts", nargs="+", choices=SCRIPTS, default=list(SCRIPTS))
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated upstream latency per request (s)")
+    parser.add_argument("--json", help="Also write results to this file")
+    parser.add_argument("--verbose", action="store_true", help="Keep the scripts' own output")
+    args = parser.parse_args()
+    if args.iterations < 1:
+        parser.error("--iterations must be at least 1")
+
+    with StubServer(FixtureSet.load(args.fixtures), latency=args.latency) as server:
+        results = [benchmark(script, server, args.iterations, args.verbose) for script in args.scripts]
+    print_report(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
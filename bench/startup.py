@@ -0,0 +1,67 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from bench.run import SCRIPTS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_breakdown(script: str) -> Tuple[float, List[Tuple[str, int, int]]]:
+    """Wall time of ``import <script>`` in a fresh interpreter plus -X importtime rows (name, self us, cumulative us)."""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {script}"],
+                            cwd=ROOT, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"import {script} failed:\n{result.stderr.splitlines()[-1]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name[1:].rstrip(), int(self_us), int(cumulative_us)))  # keep the nesting indent
+    return wall, rows
+
+
+def direct_imports(rows: List[Tuple[str, int, int]], script: str, top: int) -> List[Tuple[str, int]]:
+    """Cumulative time of each module the script imports directly.
+
+    importtime prints children before their parent, indented one level deeper, so the
+    script's subtree is the run of deeper rows just above its own row.
+    """
+    index = next(i for i, (name, _, _) in enumerate(rows) if name.strip() == script)
+    depth = len(rows[index][0]) - len(rows[index][0].lstrip())
+    children: Dict[str, int] = {}
+    for name, _, cumulative in reversed(rows[:index]):
+        indent = len(name) - len(name.lstrip())
+        if indent <= depth:
+            break
+        if indent == depth + 2:
+            children[name.strip()] = cumulative
+    return sorted(children.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time breakdown of each script's cold start.")
+    parser.add_argument("--scripts", nargs="+", choices=SCRIPTS, default=list(SCRIPTS))
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    for script in args.scripts:
+        try:
+            wall, rows = import_breakdown(script)
+        except RuntimeError as e:
+            print(e)
+            continue
+        module_us = next((cumulative for name, _, cumulative in rows if name.strip() == script), 0)
+        print(f"{script}: interpreter + import {wall * 1000:.0f} ms, module imports {module_us / 1000:.1f} ms")
+        for name, cumulative in direct_imports(rows, script, args.top):
+            print(f"    {name:<32}{cumulative / 1000:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+import argparse
+import gzip
+import json
+import struct
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+from urllib.parse import parse_qsl, urlsplit
+
+from bench.fixtures import FixtureSet
+
+
+def decode_body(body: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "zstd":
+        import zstandard
+        return zstandard.ZstdDecompressor().decompressobj().decompress(body)
+    return body
+
+
+def count_items(body: bytes, content_type: str) -> int:
+    """Entries in an upload: a JSON object or array, NDJSON lines, or a msgpack map or array."""
+    if "ndjson" in content_type:
+        return sum(1 for line in body.splitlines() if line.strip())
+    if "msgpack" in content_type:
+        first = body[0] if body else 0
+        if 0x90 <= first <= 0x9f:
+            return first & 0x0f
+        if first == 0xdc:
+            return struct.unpack(">H", body[1:3])[0]
+        if first == 0xdd:
+            return struct.unpack(">I", body[1:5])[0]
+        return 1
+    try:
+        payload = json.loads(body) if body else None
+        return len(payload) if isinstance(payload, list) else 1
+    except ValueError:
+        return 1
+
+
+class ReceiverStats:
+    """Per-path counters for POSTs that no fixture route claims, i.e. webhook uploads.
+
+    ``bytes`` is what came over the wire, ``raw_bytes`` the body after undoing its Content-Encoding.
+    """
+
+    FIELDS = ("requests", "bytes", "raw_bytes", "items")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.paths: Dict[str, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(self.FIELDS, 0))
+
+    def record(self, path: str, body: bytes, content_type: str = "application/json", encoding: str = "") -> None:
+        raw = decode_body(body, encoding)
+        items = count_items(raw, content_type)
+        with self._lock:
+            stats = self.paths[path]
+            stats["requests"] += 1
+            stats["bytes"] += len(body)
+            stats["raw_bytes"] += len(raw)
+            stats["items"] += items
+
+    def totals(self) -> Dict[str, int]:
+        with self._lock:
+            return {key: sum(stats[key] for stats in self.paths.values()) for key in self.FIELDS}
+
+    def reset(self) -> None:
+        with self._lock:
+            self.paths.clear()
+
+
+class StubServer:
+    """Local stand-in for the BSE endpoints and the webhook receivers, served from a FixtureSet."""
+
+    def __init__(self, fixtures: FixtureSet, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 upload_mbps: float = 0.0):
+        self.fixtures = fixtures
+        self.latency = latency
+        # Simulated uplink for webhook bodies, so smaller uploads show up as faster ones.
+        self.upload_mbps = upload_mbps
+        self.receiver = ReceiverStats()
+        self.served = 0
+        self._cache: Dict[str, bytes] = {}
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'StubServer':
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> 'StubServer':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _body(self, route: Dict, path: str) -> bytes:
+        key = route.get("file") or f"{route['path']}|{path}"
+        if key not in self._cache:
+            self._cache[key] = self.fixtures.body(route, path)
+        return self._cache[key]
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _respond(self, method: str) -> None:
+                parts = urlsplit(self.path)
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if server.latency:
+                    time.sleep(server.latency)
+                route = server.fixtures.match(method, parts.path, dict(parse_qsl(parts.query)))
+                if route:
+                    server.served += 1
+                    self._send(200, server._body(route, parts.path), route["content_type"])
+                elif method == "POST":
+                    if server.upload_mbps:
+                        time.sleep(len(body) * 8 / (server.upload_mbps * 1e6))
+                    server.receiver.record(parts.path, body, self.headers.get("Content-Type") or "",
+                                           (self.headers.get("Content-Encoding") or "").lower())
+                    self._send(200, b"{}", "application/json")
+                else:
+                    self._send(404, b"", "text/plain")
+
+            def _send(self, status: int, payload: bytes, content_type: str) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self._respond("GET")
+
+            def do_POST(self):
+                self._respond("POST")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recorded BSE fixtures and accept webhook uploads locally.")
+    parser.add_argument("--fixtures", default="bench/fixtures")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to delay every response")
+    args = parser.parse_args()
+
+    server = StubServer(FixtureSet.load(args.fixtures), port=args.port, latency=args.latency)
+    print(f"Serving {args.fixtures} on {server.url}. Press Ctrl+C to exit.")
+    server.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
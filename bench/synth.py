@@ -0,0 +1,207 @@
+import argparse
+import csv
+import io
+import json
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from bench import fixtures as fx
+from bench.fixtures import FixtureSet
+
+# Rough shape of an ordinary trading day; --scale multiplies every row count.
+BASELINE = {
+    "announcement_pages": 10,
+    "announcement_rows": 50,
+    "attachment_ratio": 0.6,
+    "high_rows": 150,
+    "low_rows": 60,
+    "volume_rows": 100,
+    "insider_rows": 300,
+}
+
+CATEGORIES = [
+    ("Company Update", "General"), ("Company Update", "Investor Presentation"),
+    ("Result", "Financial Results"), ("Board Meeting", "Board Meeting Intimation"),
+    ("AGM/EGM", "Postal Ballot"), ("Company Update", "Analyst / Investor Meet"),
+    ("Corp. Action", "Allotment of Equity Shares"), ("Insider Trading / SAST", "Reg. 29(2)"),
+]
+GROUPS = ["A", "B", "T", "X", "XT", "M"]
+WORDS = ("board meeting quarter results revenue profit dividend allotment shares investor "
+         "presentation transcript audio recording intimation regulation listing outcome").split()
+
+
+def make_pdf(pages: int, rng: random.Random, lines_per_page: int = 55) -> bytes:
+    """Minimal valid text PDF, so the attachment pipeline does real fitz work on it."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for _ in range(pages):
+        text = "".join(f"({' '.join(rng.choices(WORDS, k=12))}) '\n" for _ in range(lines_per_page))
+        stream = f"BT /F1 10 Tf 40 760 Td 13 TL\n{text}ET".encode()
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % k for k in kids), pages)
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    out.writelines(b"%010d 00000 n \n" % offset for offset in offsets)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def _company(rng: random.Random, i: int) -> Dict[str, str]:
+    name = f"{rng.choice(['Alpha', 'Bharat', 'Crest', 'Deccan', 'Eastern', 'Futura'])} {rng.choice(['Industries', 'Finance', 'Pharma', 'Textiles', 'Power'])} {i} Ltd"
+    return {"code": str(500000 + i), "name": name, "short": name.upper().replace(' ', '')[:12]}
+
+
+def announcement_pages(rng: random.Random, pages: int, rows: int, attachment_ratio: float, pdf_names: int) -> List[Dict]:
+    now = datetime.now()
+    payloads = []
+    for page in range(1, pages + 1):
+        table = []
+        for row in range(rows):
+            i = (page - 1) * rows + row
+            company = _company(rng, i % 4000)
+            category, subcategory = rng.choice(CATEGORIES)
+            subject = ' '.join(rng.choices(WORDS, k=6)).title()
+            has_attachment = rng.random() < attachment_ratio
+            table.append({
+                "NEWSID": f"{rng.getrandbits(64):016x}-{i}",
+                "SCRIP_CD": int(company["code"]),
+                "SLONGNAME": company["name"],
+                "NEWSSUB": f"{company['name']} - {company['code']} - {subject}",
+                "HEADLINE": f"{subject} {' '.join(rng.choices(WORDS, k=20))}.",
+                "MORE": "" if rng.random() < 0.7 else ' '.join(rng.choices(WORDS, k=80)),
+                "DissemDT": (now - timedelta(seconds=i * 17)).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-4],
+                "ATTACHMENTNAME": f"synthetic_{i % pdf_names}.pdf" if has_attachment else "",
+                "CATEGORYNAME": category,
+                "SUBCATNAME": subcategory,
+                "AUDIO_VIDEO_FILE": None,
+                "NSURL": f"https://www.bseindia.com/stock-share-price/x/{company['short']}/{company['code']}/",
+                "TotalPageCnt": pages,
+            })
+        payloads.append({"Table": table})
+    return payloads
+
+
+def high_low_csv(rng: random.Random, rows: int, data_type: str) -> bytes:
+    if data_type == 'High':
+        header = ["Security Code", "Security Name", "Group", "LTP", "52 Weeks High", "Previous 52 Weeks High",
+                  "Previous 52 Weeks High Date", "All Time High Price", "All Time High Date"]
+    else:
+        header = ["Scrip Code", "Scrip Name", "Group", "LTP", "52 Weeks Low", "Previous 52 Weeks Low",
+                  "Previous 52 Weeks Low Date", "All Time Low Price", "All Time Low Date"]
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(header)
+    for i in range(rows):
+        company = _company(rng, i)
+        price = round(rng.uniform(5, 5000), 2)
+        previous = round(price * rng.uniform(0.9, 1.0), 2)
+        day = (datetime.now() - timedelta(days=rng.randint(1, 360))).strftime("%d/%m/%Y")
+        writer.writerow([company["code"], company["short"], rng.choice(GROUPS), price, price, previous, day,
+                         "" if rng.random() < 0.8 else price, "" if rng.random() < 0.8 else day])
+    return out.getvalue().encode()
+
+
+def volume_json(rng: random.Random, rows: int) -> bytes:
+    table = []
+    for i in range(rows):
+        company = _company(rng, i)
+        volume = rng.randint(10_000, 50_000_000)
+        average = max(1, int(volume / rng.uniform(2, 40)))
+        price = rng.uniform(5, 5000)
+        change = price * rng.uniform(-0.1, 0.2)
+        table.append({
+            "scrip_cd": company["code"], "scripname": company["short"],
+            "Trd_vol": f"{volume:,}", "wkavgqty": f"{average:,}",
+            "volumechangetimes": f"{volume / average:.2f}", "TurnOver": f"{volume * price / 1e7:,.2f}",
+            "change_val": f"{change:.2f}", "Ltradert": f"{price:.2f}",
+            "change_percent": f"{change / price * 100:.2f}",
+        })
+    return json.dumps(table).encode()
+
+
+INSIDER_HTML = b"""<html><body><form method="post" action="./Insider_Trading_new.aspx">
+<input type="hidden" name="__VIEWSTATE" value="synthetic" />
+<input type="hidden" name="__EVENTVALIDATION" value="synthetic" />
+<input type="hidden" name="__EVENTTARGET" value="" />
+<input type="hidden" name="ctl00$ContentPlaceHolder1$fmdate" value="" />
+<input type="hidden" name="ctl00$ContentPlaceHolder1$eddate" value="" />
+<input type="hidden" name="ctl00$ContentPlaceHolder1$hidCurrentDate" value="" />
+</form></body></html>"""
+
+
+def insider_csv(rng: random.Random, rows: int) -> bytes:
+    header = [
+        "Security Code", "Security Name", "Name of Person", "Category of person",
+        "Number of Securities held Prior to acquisition/Disposed", "%   of  Securities held Prior to acquisition/Disposed",
+        "Type of Securities Acquired/Disposed/Pledge etc.", "Number of Securities Acquired/Disposed/Pledge etc.",
+        "Value  of Securities Acquired/Disposed/Pledge etc", "Transaction Type ( Buy/Sale/Pledge/Revoke/Invoke)",
+        "Number of Securities held Post  acquisition/Disposed/Pledge etc", "Post-Transaction % of Shareholding",
+        "Date of acquisition of shares/sale of shares/Date of Allotment(From date)",
+        "Date of acquisition of shares/sale of shares/Date of Allotment( To date  )",
+        "Mode of Acquisition", "Reported to Exchange",
+    ]
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(header)
+    for i in range(rows):
+        company = _company(rng, i % 2000)
+        held = rng.randint(1000, 10_000_000)
+        traded = rng.randint(100, 100_000)
+        day = (datetime.now() - timedelta(days=rng.randint(0, 6))).strftime("%d %b %Y")
+        writer.writerow([
+            company["code"], company["name"], f"Person {rng.randint(1, 10_000)}",
+            rng.choice(["Promoter", "Promoter Group", "Director", "Designated Person"]),
+            held, f"{rng.uniform(0, 20):.2f}", "Equity Shares", traded, traded * rng.randint(10, 3000),
+            rng.choice(["Buy", "Sale", "Pledge"]), held + traded, f"{rng.uniform(0, 20):.2f}",
+            day, day, rng.choice(["Market Purchase", "Market Sale", "Off Market"]), day,
+        ])
+    return out.getvalue().encode()
+
+
+def generate(directory: str, scale: float = 1.0, pdf_pages: int = 3, pdf_samples: int = 8, seed: int = 0) -> FixtureSet:
+    """Write a fixture set shaped like a BSE trading day, ``scale`` times the baseline volume."""
+    rng = random.Random(seed)
+    sized = {key: max(1, int(value * scale)) for key, value in BASELINE.items() if key.endswith(("_pages", "_rows"))}
+    fixtures = FixtureSet(directory)
+
+    for page, payload in enumerate(announcement_pages(rng, sized["announcement_pages"], BASELINE["announcement_rows"],
+                                                      BASELINE["attachment_ratio"], pdf_samples), 1):
+        fixtures.add("GET", fx.ANNOUNCEMENTS_PATH, f"announcements_page_{page}.json",
+                     json.dumps(payload).encode(), "application/json", {"pageno": str(page)})
+    fixtures.add_prefix("GET", fx.ATTACHMENT_PATH,
+                        {f"attachment_{i}.pdf": make_pdf(pdf_pages, rng) for i in range(pdf_samples)}, "application/pdf")
+    fixtures.add("POST", fx.EXISTING_IDS_PATH, "existing_ids.json", b'{"newsIds": []}', "application/json")
+    fixtures.add("GET", fx.HIGH_LOW_PATH, "52week_H.csv", high_low_csv(rng, sized["high_rows"], 'High'), "text/csv", {"HLflag": "H"})
+    fixtures.add("GET", fx.HIGH_LOW_PATH, "52week_L.csv", high_low_csv(rng, sized["low_rows"], 'Low'), "text/csv", {"HLflag": "L"})
+    fixtures.add("GET", fx.VOLUME_PATH, "spurt_volume.json", volume_json(rng, sized["volume_rows"]), "application/json", {"flag": "1"})
+    fixtures.add("GET", fx.INSIDER_PATH, "insider_trading.html", INSIDER_HTML, "text/html")
+    fixtures.add("POST", fx.INSIDER_PATH, "insider_trading.csv", insider_csv(rng, sized["insider_rows"]), "text/csv")
+    fixtures.save()
+    return fixtures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthesize a BSE fixture set at a multiple of normal-day volume.")
+    parser.add_argument("--out", default="bench/fixtures_synthetic")
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--pdf-pages", type=int, default=3)
+    parser.add_argument("--pdf-samples", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    fixtures = generate(args.out, args.scale, args.pdf_pages, args.pdf_samples, args.seed)
+    print(f"Wrote {len(fixtures.routes)} routes to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
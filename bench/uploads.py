@@ -0,0 +1,121 @@
+import argparse
+import csv
+import importlib
+import io
+import random
+import time
+from importlib.util import find_spec
+from typing import Callable, Dict, List, Tuple
+from unittest import mock
+
+import webhook
+from bench import synth
+from bench.fixtures import FixtureSet
+from bench.records import parsed_rows
+from bench.run import quiet
+from bench.stub_server import StubServer
+from records import Record
+
+DEFAULT_CONFIGS = ["json", "json+gzip", "json+zstd", "ndjson+gzip", "msgpack+gzip", "msgpack+zstd"]
+
+
+def announcement_rows(rows: int, seed: int, text_words: int) -> List[Record]:
+    """Parsed by the scraper's own Parser, with extracted PDF text standing in for fitz."""
+    import announcements
+    rng = random.Random(seed)
+    pages = synth.announcement_pages(rng, 1, rows, synth.BASELINE["attachment_ratio"], pdf_names=8)
+    text = lambda url, scraper: " ".join(rng.choices(synth.WORDS, k=text_words))
+    with mock.patch.object(announcements.PDFProcessor, "convert", text):
+        return [announcements.Parser.parse_entry(row, announcements.Scraper()) for row in pages[0]["Table"]]
+
+
+def high_low_rows(rows: int, seed: int) -> List[Record]:
+    from low_high import BSEScraper
+    rng, scraper = random.Random(seed), BSEScraper()
+    return [scraper._create_entry(row, data_type, scraper.COLUMN_MAP[data_type])
+            for data_type in ("High", "Low")
+            for row in csv.DictReader(io.StringIO(synth.high_low_csv(rng, rows // 2, data_type).decode()))]
+
+
+def uploader(dataset: str, url: str) -> Callable[[List[Record]], bool]:
+    """Each script's own upload path, pointed at ``url``."""
+    if dataset == "announcements":
+        import announcements
+        from upload_buffer import UploadBuffer
+
+        def upload(records):
+            buffer = UploadBuffer(announcements.ScraperScheduler(None, "", url)._upload_bodies)
+            for record in records:
+                buffer.add(record)
+            return buffer.flush() and not buffer.failed_ids
+        return upload
+    if dataset == "low_high":
+        import low_high
+
+        def upload(records):
+            with mock.patch.dict(low_high.WEBHOOK_URLS, {"high": f"{url}/high", "low": f"{url}/low"}):
+                return low_high.upload_data(records)
+        return upload
+    module = importlib.import_module(dataset)
+    return lambda records: module.upload_data(records, url)
+
+
+def available(config: str) -> bool:
+    fmt, _, compression = config.partition("+")
+    needs = {"msgpack": "msgpack", "zstd": "zstandard"}
+    return all(find_spec(needs[part]) is not None for part in (fmt, compression) if part in needs)
+
+
+def measure(server: StubServer, dataset: str, records: List[Record], config: str, rounds: int) -> Dict:
+    fmt, _, compression = config.partition("+")
+    upload = uploader(dataset, f"{server.url}/webhook/{dataset}")
+    seconds = []
+    with mock.patch.object(webhook, "FORMAT", fmt), mock.patch.object(webhook, "COMPRESSION", compression):
+        for _ in range(rounds):
+            server.receiver.reset()
+            with quiet(True):
+                start = time.perf_counter()
+                ok = upload(records)
+                seconds.append(time.perf_counter() - start)
+            if not ok:
+                raise RuntimeError(f"{dataset} upload failed with {config}")
+    return {"dataset": dataset, "config": config, "seconds": min(seconds), **server.receiver.totals()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes on the wire and upload time per webhook format and compression.")
+    parser.add_argument("--datasets", nargs="+", default=["announcements", "low_high", "volume", "insider_trading"])
+    parser.add_argument("--configs", nargs="+", default=DEFAULT_CONFIGS, help="format[+compression]")
+    parser.add_argument("--rows", type=int, default=300)
+    parser.add_argument("--text-words", type=int, default=2000, help="Words of PDF text per announcement")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.005, help="Simulated round trip per POST (s)")
+    parser.add_argument("--upload-mbps", type=float, default=20.0, help="Simulated uplink (Mbit/s), 0 for unlimited")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    skipped = [config for config in args.configs if not available(config)]
+    if skipped:
+        print(f"Skipping {', '.join(skipped)}: msgpack or zstandard not installed")
+    builders: Dict[str, Callable[[], List[Record]]] = {
+        "announcements": lambda: announcement_rows(args.rows, args.seed, args.text_words),
+        "low_high": lambda: high_low_rows(args.rows, args.seed),
+        "volume": lambda: parsed_rows("volume", args.rows, args.seed),
+        "insider_trading": lambda: parsed_rows("insider_trading", args.rows, args.seed),
+    }
+    results: List[Tuple[Dict, Dict]] = []
+    with StubServer(FixtureSet(""), latency=args.latency, upload_mbps=args.upload_mbps) as server:
+        for dataset in args.datasets:
+            records = [record for record in builders[dataset]() if record is not None]
+            rows = [measure(server, dataset, records, config, args.rounds)
+                    for config in args.configs if config not in skipped]
+            results.extend((rows[0], row) for row in rows)
+
+    print(f"{'dataset':<16}{'config':<14}{'items':>7}{'requests':>10}{'wire KB':>10}{'raw KB':>10}{'upload s':>10}{'speedup':>10}")
+    for base, r in results:
+        print(f"{r['dataset']:<16}{r['config']:<14}{r['items']:>7}{r['requests']:>10}{r['bytes'] / 1024:>10.1f}"
+              f"{r['raw_bytes'] / 1024:>10.1f}{r['seconds']:>10.3f}{base['seconds'] / r['seconds']:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
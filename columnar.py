@@ -0,0 +1,152 @@
+import glob
+import math
+import os
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Opt-in: BSE_COLUMNAR=parquet|arrow writes a typed snapshot per cycle next to the JSON day file.
+FORMAT = os.environ.get("BSE_COLUMNAR", "").lower()
+DIRECTORY = os.environ.get("BSE_COLUMNAR_DIR", "columnar")
+
+pa = pq = None
+if FORMAT:  # pyarrow alone costs hundreds of ms at startup; only pay for it when the sink is on
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        pass
+
+EXTENSIONS = {"parquet": "parquet", "arrow": "arrow"}
+
+# (column name, entry keys to read it from in order, kind)
+ColumnSpec = Tuple[str, Sequence[str], str]
+
+
+def _is_missing(value) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def to_float(value) -> Optional[float]:
+    if _is_missing(value):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).replace(',', '').strip()
+    try:
+        return float(text) if text not in ('', '-') else None
+    except ValueError:
+        return None
+
+
+def to_int(value) -> Optional[int]:
+    number = to_float(value)
+    return int(number) if number is not None else None
+
+
+def to_str(value) -> Optional[str]:
+    return None if _is_missing(value) else str(value)
+
+
+def to_timestamp(value) -> Optional[datetime]:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d %H:%M:%S") if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+CONVERTERS: Dict[str, Tuple[Callable, Callable]] = {
+    "str": (to_str, lambda: pa.string()),
+    "int": (to_int, lambda: pa.int64()),
+    "float": (to_float, lambda: pa.float64()),
+    "timestamp": (to_timestamp, lambda: pa.timestamp("s")),
+}
+
+
+class ColumnarSink:
+    """Typed per-cycle snapshots of one dataset, compacted into a single file per day."""
+
+    def __init__(self, dataset: str, columns: List[ColumnSpec], directory: str = DIRECTORY, fmt: str = FORMAT):
+        self.dataset = dataset
+        self.columns = columns
+        self.directory = directory
+        self.fmt = fmt
+        self.enabled = fmt in EXTENSIONS and pa is not None
+        if fmt and not self.enabled:
+            print(f"Columnar sink disabled for {dataset}: " +
+                  ("pyarrow is not installed" if pa is None else f"unknown format {fmt!r}"))
+        if self.enabled:
+            self.schema = pa.schema([(name, CONVERTERS[kind][1]()) for name, _, kind in columns])
+
+    def _to_table(self, entries: List[Dict]) -> 'pa.Table':
+        arrays = []
+        for name, keys, kind in self.columns:
+            convert = CONVERTERS[kind][0]
+            values = []
+            for entry in entries:
+                raw = next((entry[key] for key in keys if key in entry), None)
+                values.append(convert(raw))
+            arrays.append(pa.array(values, type=self.schema.field(name).type))
+        return pa.Table.from_arrays(arrays, schema=self.schema)
+
+    def _write(self, table: 'pa.Table', path: str) -> None:
+        tmp_path = f"{path}.tmp"
+        if self.fmt == "parquet":
+            pq.write_table(table, tmp_path, compression="zstd")
+        else:
+            with pa.OSFile(tmp_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+
+    def _read(self, path: str) -> 'pa.Table':
+        if self.fmt == "parquet":
+            return pq.read_table(path, memory_map=True)
+        return pa.ipc.open_file(pa.memory_map(path)).read_all()
+
+    def write_snapshot(self, entries: List[Dict], when: Optional[datetime] = None) -> Optional[str]:
+        if not self.enabled or not entries:
+            return None
+        when = when or datetime.now()
+        day_dir = os.path.join(self.directory, when.strftime("%Y-%m-%d"))
+        os.makedirs(day_dir, exist_ok=True)
+        path = os.path.join(day_dir, f"{self.dataset}_{when.strftime('%H%M%S%f')}.{EXTENSIONS[self.fmt]}")
+        try:
+            self._write(self._to_table(entries), path)
+            return path
+        except Exception as e:
+            print(f"Failed to write columnar snapshot {path}: {e}")
+            return None
+
+    def compact(self, date: str) -> Optional[str]:
+        """Merge one day's snapshots into ``<directory>/<date>_<dataset>.<ext>`` and drop the parts."""
+        if not self.enabled:
+            return None
+        ext = EXTENSIONS[self.fmt]
+        parts = sorted(glob.glob(os.path.join(self.directory, date, f"{self.dataset}_*.{ext}")))
+        if not parts:
+            return None
+        target = os.path.join(self.directory, f"{date}_{self.dataset}.{ext}")
+        tables = [self._read(target)] if os.path.exists(target) else []
+        tables.extend(self._read(part) for part in parts)
+        self._write(pa.concat_tables(tables), target)
+        for part in parts:
+            os.remove(part)
+        try:
+            os.rmdir(os.path.join(self.directory, date))
+        except OSError:
+            pass
+        return target
+
+    def compact_all(self) -> List[str]:
+        if not self.enabled:
+            return []
+        dates = sorted(os.path.basename(path) for path in glob.glob(os.path.join(self.directory, "????-??-??")))
+        return [target for target in (self.compact(date) for date in dates) if target]
+
+    def read_day(self, date: str) -> Optional['pa.Table']:
+        """Compacted day plus any snapshots not yet compacted, memory-mapped where the format allows."""
+        if not self.enabled:
+            return None
+        ext = EXTENSIONS[self.fmt]
+        paths = glob.glob(os.path.join(self.directory, f"{date}_{self.dataset}.{ext}"))
+        paths += sorted(glob.glob(os.path.join(self.directory, date, f"{self.dataset}_*.{ext}")))
+        return pa.concat_tables([self._read(path) for path in paths]) if paths else None
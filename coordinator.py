@@ -0,0 +1,147 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Opt-in: BSE_COORDINATOR=path/to/coordinator.db lets several announcement scrapers share work.
+DB_PATH = os.environ.get("BSE_COORDINATOR", "")
+NODE_ID = os.environ.get("BSE_NODE_ID") or f"{socket.gethostname()}:{os.getpid()}"
+LEASE_SECONDS = float(os.environ.get("BSE_LEASE_SECONDS", "300"))
+MAX_ATTEMPTS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    key TEXT PRIMARY KEY,
+    payload TEXT,
+    owner TEXT,
+    expires REAL NOT NULL DEFAULT 0,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL,
+    lane TEXT NOT NULL DEFAULT ''
+);
+"""
+INDEXES = """
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, key);
+CREATE INDEX IF NOT EXISTS jobs_lane ON jobs (lane, state, key);
+"""
+
+
+class Coordinator:
+    """Lease-based job table shared by scraper nodes through one SQLite database.
+
+    Jobs are keyed, so adding the same key twice is a no-op and each unit of work exists
+    once however many nodes discover it, in the lane it was first added to. ``claim`` leases
+    pending jobs to this node for ``lease_seconds``, which ``renew`` extends while the work
+    is still under way; a job whose holder dies before completing it becomes claimable again
+    when the lease runs out, up to ``max_attempts`` claims before it is marked failed.
+    SQLite locking only holds on a local filesystem, so nodes on different hosts need the
+    same schema on a networked database instead.
+    """
+
+    def __init__(self, path: str, node_id: str = NODE_ID, lease_seconds: float = LEASE_SECONDS,
+                 max_attempts: int = MAX_ATTEMPTS):
+        self.path = path
+        self.node_id = node_id
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+        if "lane" not in {column[1] for column in self._db.execute("PRAGMA table_info(jobs)")}:
+            self._db.execute("ALTER TABLE jobs ADD COLUMN lane TEXT NOT NULL DEFAULT ''")
+        self._db.executescript(INDEXES)
+
+    def _transaction(self, sql: str, rows: Iterable[Tuple] = ()) -> sqlite3.Cursor:
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = self._db.executemany(sql, rows)
+                self._db.execute("COMMIT")
+                return cursor
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def add(self, jobs: Iterable[Tuple[str, Optional[Dict]]], lane: str = "") -> int:
+        """Add (key, payload) jobs not seen before to ``lane``; returns how many were new."""
+        now = time.time()
+        rows = [(key, json.dumps(payload) if payload is not None else None, lane, now) for key, payload in jobs]
+        return self._transaction("INSERT OR IGNORE INTO jobs (key, payload, lane, created) VALUES (?, ?, ?, ?)",
+                                 rows).rowcount
+
+    def claim(self, prefix: str, limit: int = 1, lane: Optional[str] = None) -> List[Tuple[str, Optional[Dict]]]:
+        """Lease up to ``limit`` claimable jobs whose key starts with ``prefix``, oldest first, from ``lane`` if given."""
+        now = time.time()
+        in_lane, lane_args = ("AND lane = ? ", (lane,)) if lane is not None else ("", ())
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                # Leases that ran out on their last attempt are given up on rather than retried.
+                self._db.execute(
+                    "UPDATE jobs SET state = 'failed', owner = NULL WHERE state = 'leased' AND expires < ? AND attempts >= ?",
+                    (now, self.max_attempts))
+                rows = self._db.execute(
+                    "SELECT key, payload FROM jobs WHERE key >= ? AND key < ? " + in_lane +
+                    "AND (state = 'pending' OR (state = 'leased' AND expires < ?)) ORDER BY created, key LIMIT ?",
+                    (prefix, prefix + "\uffff", *lane_args, now, limit)).fetchall()
+                self._db.executemany(
+                    "UPDATE jobs SET state = 'leased', owner = ?, expires = ?, attempts = attempts + 1 WHERE key = ?",
+                    [(self.node_id, now + self.lease_seconds, key) for key, _ in rows])
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return [(key, json.loads(payload) if payload is not None else None) for key, payload in rows]
+
+    def complete(self, keys: Iterable[str]) -> None:
+        self._transaction("UPDATE jobs SET state = 'done', owner = NULL WHERE key = ? AND owner = ?",
+                          [(key, self.node_id) for key in keys])
+
+    def release(self, keys: Iterable[str], count_attempt: bool = True) -> None:
+        """Hand failed jobs back for any node to retry now rather than when the lease expires.
+
+        With ``count_attempt=False`` the claim doesn't count toward ``max_attempts``, for failures
+        that aren't the job's fault (a receiver outage) and must never give up on it.
+        """
+        self._transaction(
+            "UPDATE jobs SET attempts = attempts - ?, owner = NULL, "
+            "state = CASE WHEN attempts - ? >= ? THEN 'failed' ELSE 'pending' END WHERE key = ? AND owner = ?",
+            [(0 if count_attempt else 1, 0 if count_attempt else 1, self.max_attempts, key, self.node_id)
+             for key in keys])
+
+    def renew(self, keys: Iterable[str]) -> List[str]:
+        """Extend this node's leases on ``keys``; returns the ones it still holds, in order."""
+        keys = list(keys)
+        self._transaction("UPDATE jobs SET expires = ? WHERE key = ? AND owner = ? AND state = 'leased'",
+                          [(time.time() + self.lease_seconds, key, self.node_id) for key in keys])
+        with self._lock:
+            held = {key for key, in self._db.execute(
+                f"SELECT key FROM jobs WHERE owner = ? AND state = 'leased' AND key IN ({','.join('?' * len(keys))})",
+                (self.node_id, *keys))} if keys else set()
+        return [key for key in keys if key in held]
+
+    def leased(self, key: str) -> bool:
+        """Whether some node holds an unexpired lease on ``key``."""
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM jobs WHERE key = ? AND state = 'leased' AND expires >= ?",
+                                    (key, time.time())).fetchone() is not None
+
+    def counts(self, prefix: str = "") -> Dict[str, int]:
+        with self._lock:
+            rows = self._db.execute("SELECT state, COUNT(*) FROM jobs WHERE key >= ? AND key < ? GROUP BY state",
+                                    (prefix, prefix + "\uffff")).fetchall()
+        return dict(rows)
+
+    def prune(self, older_than_seconds: float = 2 * 86400) -> None:
+        """Forget settled jobs; keys stay deduplicated for as long as they're kept."""
+        self._transaction("DELETE FROM jobs WHERE state IN ('done', 'failed') AND created < ?",
+                          [(time.time() - older_than_seconds,)])
+
+
+def from_env() -> Optional[Coordinator]:
+    return Coordinator(DB_PATH) if DB_PATH else None
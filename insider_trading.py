@@ -1,16 +1,25 @@
-from curl_cffi import requests
-from bs4 import BeautifulSoup
-import json
+from __future__ import annotations
 import time
 import schedule
 from datetime import datetime, timedelta
-import glob
 import os
 import csv
 from io import StringIO
 from typing import List, Dict, Set, Optional
 from loguru import logger
 
+import market_calendar
+import proxy_pool
+import serialization
+import tracing
+import webhook
+from retention import RetentionManager
+from lazy import lazy_import, report_startup
+from records import InsiderTrade
+
+bs4 = lazy_import("bs4")
+requests = lazy_import("curl_cffi.requests")
+
 class InsiderTradingScraper:
     BASE_URL = "https://www.bseindia.com/corporates/Insider_Trading_new.aspx"
     HEADERS = {
@@ -32,15 +41,21 @@ class InsiderTradingScraper:
         'sec-ch-ua-platform': '"macOS"',
     }
 
-    def __init__(self, retries: int = 3, retry_delay: int = 10, proxies: Optional[Dict] = None):
+    def __init__(self, retries: int = 3, retry_delay: int = 10, proxies: Optional[Dict] = None,
+                 pool: Optional[proxy_pool.ProxyPool] = None):
         self.retries = retries
         self.retry_delay = retry_delay
         self.proxies = proxies or {}
+        self.pool = pool
 
-    def fetch_data(self) -> List[Dict]:
+    def fetch_data(self) -> List[InsiderTrade]:
         try:
             session = self._create_session()
-            csv_data = self._fetch_csv_data(session)
+            # The CSV POST replays the GET's viewstate and cookies, so both go through one proxy.
+            with proxy_pool.route(self.proxies, self.pool) as route:
+                csv_data = self._fetch_csv_data(session, route)
+                if not csv_data:
+                    route.fail()
             if not csv_data:
                 logger.error("Failed to fetch CSV data")
                 return []
@@ -55,9 +70,10 @@ class InsiderTradingScraper:
             session.proxies = self.proxies
         return session
 
-    def _fetch_csv_data(self, session) -> Optional[str]:
+    def _fetch_csv_data(self, session, route: proxy_pool.Route) -> Optional[str]:
         get_response = self._make_request(
             session=session,
+            route=route,
             method='GET',
             url=self.BASE_URL, 
             headers=self.HEADERS
@@ -68,6 +84,7 @@ class InsiderTradingScraper:
         data = self._get_request_data(get_response.text)
         post_response = self._make_request(
             session=session,
+            route=route,
             method='POST',
             url=self.BASE_URL, 
             data=data,
@@ -79,7 +96,7 @@ class InsiderTradingScraper:
             return None
         return post_response.text
 
-    def _make_request(self, session, method: str, url: str, headers: Optional[Dict] = None, 
+    def _make_request(self, session, route: proxy_pool.Route, method: str, url: str, headers: Optional[Dict] = None, 
                  data: Optional[Dict] = None, cookies: Optional[Dict] = None, 
                  json_data: Optional[Dict] = None) -> Optional[requests.Response]:
         headers = headers or self.HEADERS
@@ -92,9 +109,12 @@ class InsiderTradingScraper:
                     data=data,
                     cookies=cookies, 
                     json=json_data, 
+                    proxies=route.proxies or None,
                     timeout=60,
                     impersonate="chrome131"
                 )
+                if response.status_code in proxy_pool.THROTTLED_STATUSES:
+                    route.fail()
                 response.raise_for_status()
                 return response
             except Exception as e:
@@ -114,7 +134,7 @@ class InsiderTradingScraper:
         return None
 
     def _get_request_data(self, response_text: str) -> Dict:
-        soup = BeautifulSoup(response_text, 'html.parser')
+        soup = bs4.BeautifulSoup(response_text, 'html.parser')
         data = {tag.get('name'): tag.get('value', '') for tag in soup.select('input[type="hidden"]')}
         required_fields = {
             '__EVENTTARGET': 'ctl00$ContentPlaceHolder1$lnkDownload',
@@ -128,7 +148,7 @@ class InsiderTradingScraper:
             data[field] = value
         return data
 
-    def _process_csv_data(self, csv_text: str) -> List[Dict]:
+    def _process_csv_data(self, csv_text: str) -> List[InsiderTrade]:
         results, error_count = [], 0
         try:
             csv_reader = csv.DictReader(StringIO(csv_text))
@@ -141,7 +161,7 @@ class InsiderTradingScraper:
                     reported_date_str = row.get('Reported to Exchange', '').strip()
                     formatted_reported_date = self._format_date(reported_date_str, 'slash')
 
-                    processed = {
+                    processed = InsiderTrade(**{
                         "symbol": row.get('Security Code', '').strip(),
                         "companyName": row.get('Security Name', '').strip(),
                         "nameOfPerson": row.get('Name of Person', '').strip(),
@@ -156,7 +176,7 @@ class InsiderTradingScraper:
                         "modeOfAquisition": row.get('Mode of Acquisition', '').strip(),
                         "reportedToExchange": formatted_reported_date,
                         "exchange": 'bse'
-                    }
+                    })
                     results.append(processed)
                 except Exception as e:
                     error_count += 1
@@ -187,12 +207,12 @@ class InsiderTradingScraper:
             logger.warning(f"Could not parse date string: {date_str}")
             return date_str
 
-    def _process_row(self, row) -> Optional[Dict]:
+    def _process_row(self, row) -> Optional[InsiderTrade]:
         cols = row.find_all('td')
         if len(cols) < 16:
             return None
         try:
-            return {
+            return InsiderTrade(**{
                 "symbol": self._clean_text(cols[0].get_text()),
                 "companyName": self._clean_text(cols[1].get_text()),
                 "nameOfPerson": self._clean_text(cols[2].get_text()),
@@ -209,101 +229,88 @@ class InsiderTradingScraper:
                 "exchange": 'bse',
                 "_crawledTime": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                 "_crawler": "insider_trading"
-            }
+            })
         except IndexError as e:
             logger.error(f"Error processing row: {e}")
             return None
 
-def load_existing_entries() -> Set[str]:
+RETENTION = RetentionManager("insider_trading", adopt=["*_insider_trading.json"], log=logger.info)
+
+def load_existing_entries() -> Set[bytes]:
     seen = set()
-    for file in glob.glob("*_insider_trading.json"):
+    for file in RETENTION.live_files():
         try:
-            with open(file) as f:
-                data = json.load(f)
-                seen.update(json.dumps(entry, sort_keys=True) for entry in data.get('entries', []))
-        except (json.JSONDecodeError, IOError, KeyError) as e:
+            seen.update(InsiderTrade.key_of(entry) for entry in serialization.read_entries(file))
+        except (*serialization.DECODE_ERRORS, IOError, KeyError) as e:
             logger.error(f"Skipping invalid file {file}: {e}")
     return seen
 
-def manage_files(output_filename: str):
-    today = datetime.today().date()
-    for path in glob.glob("*_insider_trading.json"):
-        if path == output_filename:
-            continue
-        try:
-            file_date = datetime.strptime(os.path.basename(path).split('_')[0], "%Y-%m-%d").date()
-            if file_date < today:
-                os.remove(path)
-                logger.info(f"Removed outdated file: {path}")
-        except ValueError:
-            continue
-    for path in glob.glob("logs/insider_trading_*.log"):
-        try:
-            file_date_str = os.path.basename(path).split('_')[-1].split('.')[0]
-            file_date = datetime.strptime(file_date_str, "%Y-%m-%d").date()
-            if file_date < today:
-                os.remove(path)
-                logger.info(f"Removed outdated log file: {path}")
-        except (ValueError, IndexError):
-            continue
-
-def upload_data(entries: List[Dict], webhook_url: str) -> bool:
+def upload_data(entries: List[InsiderTrade], webhook_url: str) -> bool:
     session = requests.Session()
     success = True
-    for entry in entries:
+    for batch, body, headers in webhook.requests_for(entries):
         response = None
+        name = f"{len(batch)} entries" if len(batch) > 1 else batch[0].symbol or 'unknown'
         for attempt in range(1, 3):
             try:
                 response = session.post(
                     webhook_url,
-                    json=entry,
+                    data=body,
+                    headers=headers,
                     timeout=30
                 )
                 response.raise_for_status()
-                logger.info(f"Uploaded {entry.get('symbol', 'unknown')} successfully")
+                logger.info(f"Uploaded {name} successfully")
                 break
             except Exception as e:
-                logger.warning(f"Upload attempt {attempt} for {entry.get('symbol', 'unknown')} failed: {str(e)}")
+                logger.warning(f"Upload attempt {attempt} for {name} failed: {str(e)}")
                 if attempt < 2:
                     sleep_time = 5 * attempt
                     logger.info(f"Waiting {sleep_time}s before retry...")
                     time.sleep(sleep_time)
         if not response or response.status_code >= 400:
             success = False
-            logger.error(f"Failed to upload {entry.get('symbol', 'unknown')}")
+            logger.error(f"Failed to upload {name}")
     return success
 
 
 def fetch_and_save_job(proxies: Optional[Dict] = None, webhook_url: Optional[str] = None):
+    with tracing.cycle("insider_trading", emit=logger.info) as cycle:
+        _fetch_and_save(cycle, proxies, webhook_url)
+
+
+def _fetch_and_save(cycle, proxies: Optional[Dict], webhook_url: Optional[str]):
     logger.info("Fetching insider trading data...")
     scraper = InsiderTradingScraper(proxies=proxies)
-    new_entries = scraper.fetch_data()
+    with tracing.span("fetch"):
+        new_entries = scraper.fetch_data()
     logger.info(f"Found {len(new_entries)} entries on website")
-    seen = load_existing_entries()
-    new_entries = [e for e in new_entries if json.dumps(e, sort_keys=True) not in seen]
+    with tracing.span("dedup_set_build") as span:
+        seen = load_existing_entries()
+        span.count(seen=len(seen))
+    fetched = len(new_entries)
+    with tracing.span("dedup_filter"):
+        new_entries = [e for e in new_entries if e.key not in seen]
+    cycle.count(fetched=fetched, new=len(new_entries))
     if not new_entries:
         logger.info("No new entries found")
         return
     current_date = datetime.now().strftime("%Y-%m-%d")
     output_file = f"{current_date}_insider_trading.json"
-    try:
-        with open(output_file, 'r') as f:
-            existing = json.load(f).get('entries', [])
-    except (FileNotFoundError, json.JSONDecodeError):
-        existing = []
-    with open(output_file, 'w') as f:
-        json.dump({"entries": existing + new_entries}, f, indent=2)
+    with tracing.span("save", new=len(new_entries)):
+        serialization.append_entries(output_file, (entry.to_json() for entry in new_entries), log=logger.error)
+        RETENTION.record(output_file)
     logger.info(f"Saved {len(new_entries)} new entries to {output_file}")
     if webhook_url:
-        upload_success = upload_data(new_entries, webhook_url)
+        with tracing.span("upload", entries=len(new_entries)):
+            upload_success = upload_data(new_entries, webhook_url)
         logger.info("Upload completed successfully" if upload_success else "Upload failed")
     else:
         logger.warning("Webhook URL not provided, skipping upload.")
 
 
 def file_management_job():
-    current_date = datetime.now().strftime("%Y-%m-%d")
-    manage_files(f"{current_date}_insider_trading.json")
+    RETENTION.rollover()
 
 def setup_logging():
     os.makedirs("logs", exist_ok=True)
@@ -313,6 +320,7 @@ def setup_logging():
         log_file,
         rotation="1 day",
         retention="7 days",
+        compression="gz",
         format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
         level="INFO"
     )
@@ -327,14 +335,16 @@ def setup_logging():
 def main():
     setup_logging()
     logger.info("Insider Trading Service started. Press Ctrl+C to exit.")
+    report_startup("Insider Trading Service", emit=logger.info)
     proxies = {
         "http": "",
         "https": ""
     }
     webhook_url = "http://localhost:80/insider-trading"
-    fetch_and_save_job(proxies=proxies, webhook_url=webhook_url)
+    poller = market_calendar.AdaptivePoller("insider_trading")
+    poller.run(fetch_and_save_job, proxies=proxies, webhook_url=webhook_url)
     file_management_job()
-    schedule.every(5).minutes.do(fetch_and_save_job, proxies=proxies, webhook_url=webhook_url)
+    schedule.every(30).seconds.do(poller.run, fetch_and_save_job, proxies=proxies, webhook_url=webhook_url)
     schedule.every().hour.do(file_management_job)
     try:
         while True:
@@ -0,0 +1,50 @@
+import importlib
+import os
+import time
+import types
+from typing import Callable, Dict
+
+# BSE_STARTUP_REPORT=1 prints how long the entry point took to become ready and each
+# deferred import as it happens, so cold-start regressions show up in the service log.
+STARTUP_REPORT = os.environ.get("BSE_STARTUP_REPORT", "").lower() in ("1", "true", "yes")
+LOADED_AT = time.perf_counter()
+IMPORT_TIMINGS: Dict[str, float] = {}
+_emit: Callable[[str], None] = print
+
+
+class LazyModule(types.ModuleType):
+    """Stand-in that imports the real module on first attribute access."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_module"]
+        if module is None:
+            start = time.perf_counter()
+            module = importlib.import_module(self.__name__)
+            IMPORT_TIMINGS[self.__name__] = time.perf_counter() - start
+            self.__dict__["_module"] = module
+            if STARTUP_REPORT:
+                _emit(f"Lazy import {self.__name__}: {IMPORT_TIMINGS[self.__name__] * 1000:.1f} ms")
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name: str) -> LazyModule:
+    return LazyModule(name)
+
+
+def report_startup(service: str, emit: Callable[[str], None] = print) -> None:
+    """Log time from the first script import to the service being ready to schedule work."""
+    global _emit
+    _emit = emit
+    if STARTUP_REPORT:
+        deferred = ", ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in IMPORT_TIMINGS.items()) or "none yet"
+        emit(f"{service} ready in {(time.perf_counter() - LOADED_AT) * 1000:.1f} ms after import; deferred imports: {deferred}")
@@ -1,14 +1,23 @@
-from curl_cffi import requests
-import pandas as pd
+from __future__ import annotations
 import io
 import time
-import json
 from datetime import datetime
-import glob
-import os
 from typing import Dict, List, Optional, Set
 import schedule
 
+import market_calendar
+import proxy_pool
+import serialization
+import tracing
+import webhook
+from lazy import lazy_import, report_startup
+from columnar import ColumnarSink
+from retention import RetentionManager, file_date
+from records import HIGH_LOW_RECORDS, Record, to_dicts
+
+pd = lazy_import("pandas")
+requests = lazy_import("curl_cffi.requests")
+
 
 class BSEScraper:
     BASE_URL = "https://api.bseindia.com/BseIndiaAPI/api/HLDownloadCSVNew/w"
@@ -40,9 +49,12 @@ class BSEScraper:
         }
     }
 
-    def __init__(self, retries: int = 3, retry_delay: int = 5):
+    def __init__(self, retries: int = 3, retry_delay: int = 5, proxies: Optional[Dict] = None,
+                 pool: Optional[proxy_pool.ProxyPool] = None):
         self.retries = retries
         self.retry_delay = retry_delay
+        self.proxies = proxies or {}
+        self.pool = pool
         self.base_params = {
             'scripcode': '',
             'Grpcode': '',
@@ -50,22 +62,30 @@ class BSEScraper:
             'EQflag': '1',
         }
 
-    def fetch_all_data(self) -> Dict[str, List[Dict]]:
+    def fetch_all_data(self) -> Dict[str, List[Record]]:
         results = {}
         for data_type in ['High', 'Low']:
             results[data_type] = self._process_data_type(data_type)
         return results
 
-    def _process_data_type(self, data_type: str) -> List[Dict]:
+    def _process_data_type(self, data_type: str) -> List[Record]:
         params = self.base_params.copy()
         params['HLflag'] = 'H' if data_type == 'High' else 'L'
-        df = self._fetch_with_retry(params)
-        return self._process_df(df, data_type) if df is not None else []
+        with tracing.span(f"fetch_{data_type.lower()}"):
+            df = self._fetch_with_retry(params)
+        if df is None:
+            return []
+        with tracing.span(f"process_{data_type.lower()}", rows=len(df)):
+            return self._process_df(df, data_type)
 
     def _fetch_with_retry(self, params: Dict) -> Optional[pd.DataFrame]:
         for attempt in range(1, self.retries + 1):
             try:
-                response = requests.get(self.BASE_URL, headers=self.HEADERS, params=params, timeout=30)
+                with proxy_pool.route(self.proxies, self.pool) as route:
+                    response = requests.get(self.BASE_URL, headers=self.HEADERS, params=params,
+                                            proxies=route.proxies, timeout=30)
+                    if response.status_code in proxy_pool.THROTTLED_STATUSES:
+                        route.fail()
                 response.raise_for_status()
                 return pd.read_csv(io.StringIO(response.text)) if response.content else None
             except Exception as e:
@@ -73,12 +93,12 @@ class BSEScraper:
                 time.sleep(self.retry_delay if attempt < self.retries else 0)
         return None
 
-    def _process_df(self, df: pd.DataFrame, data_type: str) -> List[Dict]:
+    def _process_df(self, df: pd.DataFrame, data_type: str) -> List[Record]:
         cols = self.COLUMN_MAP[data_type]
         return [self._create_entry(row, data_type, cols) for _, row in df.iterrows()]
 
-    def _create_entry(self, row: pd.Series, data_type: str, cols: Dict) -> Dict:
-        return {
+    def _create_entry(self, row: pd.Series, data_type: str, cols: Dict) -> Record:
+        return HIGH_LOW_RECORDS[data_type.lower()](**{
             "currentPrice": row.get("LTP"),
             f"previous{data_type}": row.get(cols['prev_value']),
             f"previous{data_type}Date": row.get(cols['prev_date']),
@@ -91,49 +111,56 @@ class BSEScraper:
             "type": data_type.lower(),
             "_crawledTime": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "_crawler": "52week_highlow_scraper",
-        }
+        })
+
+
+# previousHigh/previousLow etc. share one column each, told apart by "type".
+COLUMNAR_SINK = ColumnarSink("52week_highlow", [
+    ("symbol", ["symbol"], "str"),
+    ("bseCode", ["bseCode"], "int"),
+    ("group", ["group"], "str"),
+    ("type", ["type"], "str"),
+    ("currentPrice", ["currentPrice"], "float"),
+    ("newValue", ["newHigh", "newLow"], "float"),
+    ("previousValue", ["previousHigh", "previousLow"], "float"),
+    ("previousDate", ["previousHighDate", "previousLowDate"], "str"),
+    ("allTime", ["allTimeHigh", "allTimeLow"], "str"),
+    ("exchange", ["exchange"], "str"),
+    ("crawledTime", ["_crawledTime"], "timestamp"),
+])
+
 
+RETENTION = RetentionManager("52week_highlow", adopt=["*_52week_highlow.json"])
 
-def load_existing_entries() -> Set[str]:
+
+def load_existing_entries() -> Set[bytes]:
     seen = set()
-    for file in glob.glob("*_52week_highlow.json"):
+    for file in RETENTION.live_files():
         try:
-            with open(file) as f:
-                data = json.load(f)
-                seen.update(json.dumps(entry, sort_keys=True) for entry in data.get('entries', []))
-        except (json.JSONDecodeError, IOError, KeyError) as e:
+            seen.update(
+                HIGH_LOW_RECORDS[entry["type"]].key_of(entry)
+                for entry in serialization.read_entries(file) if entry.get("type") in HIGH_LOW_RECORDS
+            )
+        except (*serialization.DECODE_ERRORS, IOError, KeyError) as e:
             print(f"Skipping invalid file {file}: {e}")
     return seen
 
 
-def manage_files(output_filename: str):
-    today = datetime.today().date()
-    for path in glob.glob("*_52week_highlow.json"):
-        if path == output_filename:
-            continue
-        try:
-            file_date = datetime.strptime(os.path.basename(path).split('_')[0], "%Y-%m-%d").date()
-            if file_date < today:
-                os.remove(path)
-                print(f"Removed outdated file: {path}")
-        except ValueError:
-            continue
+def is_market_hours() -> bool:
+    return market_calendar.is_market_hours()
 
 
-def is_market_hours() -> bool:
-    now = datetime.now()
-    return now.weekday() < 5 and datetime.strptime("08:15", "%H:%M").time() <= now.time() <= datetime.strptime("16:45", "%H:%M").time()
+WEBHOOK_URLS = {
+    "high": "http://localhost:80/fifty-week/high",
+    "low": "http://localhost:80/fifty-week/low"
+}
 
 
-def upload_data(entries: List[Dict]) -> bool:
+def upload_data(entries: List[Record]) -> bool:
     """Common upload function that uploads high/low entries to their respective endpoints."""
-    webhook_urls = {
-        "high": "http://localhost:80/fifty-week/high",
-        "low": "http://localhost:80/fifty-week/low"
-    }
     entries_by_type = {"high": [], "low": []}
     for entry in entries:
-        entry_type = entry.get("type")
+        entry_type = entry.type
         if entry_type in entries_by_type:
             entries_by_type[entry_type].append(entry)
     print(f"Uploading high: {len(entries_by_type['high'])}, low: {len(entries_by_type['low'])} entries")
@@ -141,19 +168,20 @@ def upload_data(entries: List[Dict]) -> bool:
     for entry_type, type_entries in entries_by_type.items():
         if not type_entries:
             continue
-        print(f"Uploading {len(type_entries)} individual {entry_type} entries")
-        for entry in type_entries:
+        print(f"Uploading {len(type_entries)} {entry_type} entries"
+              + (f" in batches of {webhook.BATCH_ENTRIES}" if webhook.batched() else " individually"))
+        for batch, body, headers in webhook.requests_for(type_entries):
             for attempt in range(retries):
                 try:
-                    response = requests.post(webhook_urls[entry_type], json=entry)
+                    response = requests.post(WEBHOOK_URLS[entry_type], data=body, headers=headers)
                     response.raise_for_status()
-                    print(f"Uploaded one {entry_type} entry successfully (attempt {attempt + 1}) - {entry['symbol']}")
-                    break # Break from retry loop for this entry
+                    print(f"Uploaded {len(batch)} {entry_type} entries successfully (attempt {attempt + 1}) - {batch[0].symbol}")
+                    break # Break from retry loop for this request
                 except Exception as e:
-                    print(f"Failed to upload one {entry_type} entry (attempt {attempt + 1}): {e}")
+                    print(f"Failed to upload {len(batch)} {entry_type} entries (attempt {attempt + 1}): {e}")
                     if attempt == retries - 1:
                         success = False # Mark overall success as False if last attempt fails
-                        print(f"Giving up on uploading one {entry_type} entry after {retries} attempts.")
+                        print(f"Giving up on uploading {len(batch)} {entry_type} entries after {retries} attempts.")
                     time.sleep(retry_delay if attempt < retries - 1 else 0)
     return success
 
@@ -161,31 +189,37 @@ def upload_data(entries: List[Dict]) -> bool:
 def fetch_and_save_job():
     if not is_market_hours():
         return
+    with tracing.cycle("52week_highlow") as cycle:
+        _fetch_and_save(cycle)
+
+
+def _fetch_and_save(cycle):
     scraper = BSEScraper()
     data = scraper.fetch_all_data()
     all_entries = [entry for entries in data.values() for entry in entries]
     print(f"Found {len(all_entries)} entries on website")
-    seen = load_existing_entries()
-    new_entries = [e for e in all_entries if json.dumps(e, sort_keys=True) not in seen]
+    with tracing.span("dedup_set_build") as span:
+        seen = load_existing_entries()
+        span.count(seen=len(seen))
+    with tracing.span("dedup_filter"):
+        new_entries = [e for e in all_entries if e.key not in seen]
+    cycle.count(fetched=len(all_entries), new=len(new_entries))
     print(f"Identified {len(new_entries)} new entries")
     print("-" * 100) if not new_entries else None
     if not new_entries:
         return
     current_date = datetime.now().strftime("%Y-%m-%d")
     output_file = f"{current_date}_52week_highlow.json"
-    existing_entries_today = []
-    if os.path.exists(output_file):
-        try:
-            with open(output_file, 'r') as f:
-                existing_data = json.load(f)
-                existing_entries_today = existing_data.get('entries', [])
-        except Exception as e:
-            print(f"Error loading today's file: {e}")
-    combined_entries = existing_entries_today + new_entries
-    with open(output_file, 'w') as f:
-        json.dump({"entries": combined_entries}, f, indent=2)
+    with tracing.span("save", new=len(new_entries)):
+        serialization.append_entries(output_file, (entry.to_json() for entry in new_entries))
+        RETENTION.record(output_file)
     print(f"[{datetime.now()}] Saved {len(new_entries)} new entries to {output_file}")
-    success = upload_data(new_entries)
+    if COLUMNAR_SINK.enabled:
+        with tracing.span("columnar_snapshot"):
+            if snapshot := COLUMNAR_SINK.write_snapshot(to_dicts(new_entries)):
+                RETENTION.record(snapshot, in_place=True)
+    with tracing.span("upload", entries=len(new_entries)):
+        success = upload_data(new_entries)
     if success:
         print("__" * 100)
     else:
@@ -193,17 +227,24 @@ def fetch_and_save_job():
 
 
 def file_management_job():
-    if not is_market_hours():
-        return
-    current_date = datetime.now().strftime("%Y-%m-%d")
-    output_file = f"{current_date}_52week_highlow.json"
-    manage_files(output_file)
+    RETENTION.rollover()
+
+
+def columnar_compaction_job():
+    for path in COLUMNAR_SINK.compact_all():
+        print(f"Compacted columnar snapshots into {path}")
+        RETENTION.record(path, day=file_date(path), in_place=True)
+    RETENTION.forget_missing()
 
 
 def main():
-    schedule.every(2).minutes.do(fetch_and_save_job)
+    poller = market_calendar.AdaptivePoller("52week_highlow")
+    schedule.every(30).seconds.do(poller.run, fetch_and_save_job)
     schedule.every().hour.do(file_management_job)
+    if COLUMNAR_SINK.enabled:
+        schedule.every().day.at("17:00").do(columnar_compaction_job)
     print("52week HighLow Service started. Press Ctrl+C to exit.")
+    report_startup("52week HighLow Service")
     try:
         while True:
             schedule.run_pending()
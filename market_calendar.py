@@ -0,0 +1,79 @@
+import json
+import os
+import time
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+
+HOLIDAYS_FILE = os.environ.get("BSE_HOLIDAYS_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "bse_holidays.json"))
+
+# Session phases of a trading day (start inclusive, end exclusive), IST wall clock.
+PHASES = [
+    ("overnight", "00:00", "08:15"),
+    ("pre_open", "08:15", "09:15"),
+    ("normal", "09:15", "15:30"),
+    ("post_close", "15:30", "16:45"),
+    ("after_hours", "16:45", "22:00"),
+    ("overnight", "22:00", "24:00"),
+]
+MARKET_PHASES = ("pre_open", "normal", "post_close")
+
+# Poll interval in seconds per job and phase; None means the job doesn't run in that phase.
+# Results are mostly filed right after the close and into the evening, so announcements
+# poll fastest then and back off overnight and on holidays.
+POLL_INTERVALS: Dict[str, Dict[str, Optional[int]]] = {
+    "announcements": {"pre_open": 120, "normal": 120, "post_close": 60, "after_hours": 90, "overnight": 900, "holiday": 900},
+    "52week_highlow": {"pre_open": 120, "normal": 120, "post_close": 120, "after_hours": None, "overnight": None, "holiday": None},
+    "volume": {"pre_open": 300, "normal": 300, "post_close": 300, "after_hours": None, "overnight": None, "holiday": None},
+    "insider_trading": {"pre_open": 300, "normal": 300, "post_close": 300, "after_hours": 300, "overnight": 1800, "holiday": 3600},
+}
+
+
+@lru_cache(maxsize=1)
+def holidays(path: str = HOLIDAYS_FILE) -> Dict[date, str]:
+    try:
+        with open(path) as f:
+            return {datetime.strptime(h["date"], "%Y-%m-%d").date(): h["name"] for h in json.load(f)["holidays"]}
+    except (IOError, ValueError, KeyError) as e:
+        print(f"Could not load holiday calendar {path}, treating every weekday as a trading day: {e}")
+        return {}
+
+
+def is_trading_day(day: Optional[date] = None) -> bool:
+    day = day or datetime.now().date()
+    return day.weekday() < 5 and day not in holidays()
+
+
+def phase(now: Optional[datetime] = None) -> str:
+    now = now or datetime.now()
+    if not is_trading_day(now.date()):
+        return "holiday"
+    clock = now.strftime("%H:%M")
+    return next(name for name, start, end in PHASES if start <= clock < end)
+
+
+def is_market_hours(now: Optional[datetime] = None) -> bool:
+    return phase(now) in MARKET_PHASES
+
+
+def poll_interval(job: str, now: Optional[datetime] = None) -> Optional[int]:
+    return POLL_INTERVALS[job][phase(now)]
+
+
+class AdaptivePoller:
+    """Runs a job from a fine-grained schedule tick only when its phase interval has elapsed."""
+
+    def __init__(self, job: str):
+        self.job = job
+        self.last_run: Optional[float] = None
+
+    def due(self, now: Optional[datetime] = None) -> bool:
+        interval = poll_interval(self.job, now)
+        if interval is None:
+            return False
+        return self.last_run is None or time.monotonic() - self.last_run >= interval
+
+    def run(self, job: Callable, *args, **kwargs) -> None:
+        if self.due():
+            self.last_run = time.monotonic()
+            job(*args, **kwargs)
@@ -0,0 +1,129 @@
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+# Opt-in: BSE_PROXY_POOL=http://host1:port,http://host2:port (or a file with one proxy per line)
+# routes every BSE request through the healthiest proxy instead of each script's static one.
+POOL_SPEC = os.environ.get("BSE_PROXY_POOL", "")
+
+THROTTLED_STATUSES = (403, 429, 502, 503, 504)
+
+
+class ProxyStats:
+    def __init__(self, url: str):
+        self.url = url
+        self.latency: Optional[float] = None  # EWMA seconds of successful requests
+        self.error_rate = 0.0  # EWMA of failures
+        self.in_flight = 0
+        self.consecutive_failures = 0
+        self.benched_until = 0.0
+        self.requests = 0
+
+    def score(self) -> float:
+        """Lower is better: slow, failing and busy proxies all rank down; unmeasured ones get tried first."""
+        return ((self.latency or 0.0) + 0.1) * (1 + self.in_flight) * (1 + 10 * self.error_rate)
+
+
+class Route:
+    """One request's proxy; mark it failed for responses that didn't raise but still count against the proxy."""
+
+    def __init__(self, proxies: Dict[str, str]):
+        self.proxies = proxies
+        self.failed = False
+
+    def fail(self) -> None:
+        self.failed = True
+
+
+class ProxyPool:
+    """Routes requests across proxies by measured latency, error rate and current load.
+
+    Every request is timed and scored against the proxy it went through. A proxy that fails
+    ``bench_after`` times in a row sits out for ``cooldown`` seconds, doubling each time it
+    comes back and fails again, unless every proxy is benched. ``explore`` of the requests go
+    to a random available proxy so recovering ones get measured again.
+    """
+
+    def __init__(self, urls: List[str], alpha: float = 0.3, bench_after: int = 3, cooldown: float = 30.0,
+                 explore: float = 0.05):
+        if not urls:
+            raise ValueError("ProxyPool needs at least one proxy")
+        self.stats = [ProxyStats(url) for url in urls]
+        self.alpha = alpha
+        self.bench_after = bench_after
+        self.cooldown = cooldown
+        self.explore = explore
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_spec(cls, spec: str) -> 'ProxyPool':
+        if os.path.isfile(spec):
+            with open(spec) as f:
+                urls = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+        else:
+            urls = [url.strip() for url in spec.split(',') if url.strip()]
+        return cls(urls)
+
+    def _acquire(self) -> ProxyStats:
+        with self._lock:
+            now = time.monotonic()
+            available = [stats for stats in self.stats if stats.benched_until <= now] or self.stats
+            if len(available) > 1 and random.random() < self.explore:
+                chosen = random.choice(available)
+            else:
+                chosen = min(available, key=ProxyStats.score)
+            chosen.in_flight += 1
+            return chosen
+
+    def _release(self, stats: ProxyStats, elapsed: float, ok: bool) -> None:
+        with self._lock:
+            stats.in_flight -= 1
+            stats.requests += 1
+            stats.error_rate += self.alpha * ((0.0 if ok else 1.0) - stats.error_rate)
+            if ok:
+                stats.latency = elapsed if stats.latency is None else stats.latency + self.alpha * (elapsed - stats.latency)
+                stats.consecutive_failures = 0
+                return
+            stats.consecutive_failures += 1
+            if stats.consecutive_failures >= self.bench_after:
+                strikes = stats.consecutive_failures - self.bench_after
+                stats.benched_until = time.monotonic() + self.cooldown * 2 ** min(strikes, 5)
+
+    @contextmanager
+    def route(self) -> Iterator[Route]:
+        stats = self._acquire()
+        route = Route({"http": stats.url, "https": stats.url})
+        start = time.monotonic()
+        try:
+            yield route
+        except BaseException:
+            route.failed = True
+            raise
+        finally:
+            self._release(stats, time.monotonic() - start, not route.failed)
+
+    def summary(self) -> str:
+        with self._lock:
+            now = time.monotonic()
+            return ", ".join(
+                f"{s.url} {f'{s.latency * 1000:.0f}ms' if s.latency is not None else 'unmeasured'} err {s.error_rate:.0%}"
+                + (" benched" if s.benched_until > now else "")
+                for s in sorted(self.stats, key=ProxyStats.score)
+            )
+
+
+POOL = ProxyPool.from_spec(POOL_SPEC) if POOL_SPEC else None
+
+
+@contextmanager
+def route(static_proxies: Optional[Dict] = None, pool: Optional[ProxyPool] = None) -> Iterator[Route]:
+    """Proxies for one request: from ``pool`` (or the env-configured pool) if there is one, else the static dict."""
+    pool = pool or POOL
+    if pool is None:
+        yield Route(static_proxies or {})
+        return
+    with pool.route() as chosen:
+        yield chosen
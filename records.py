@@ -0,0 +1,119 @@
+from typing import Dict, Iterable, List, Tuple, Type
+
+from serialization import canonical
+
+# Crawl bookkeeping; differs between otherwise identical rows, so never part of a record's key.
+CRAWL_FIELDS = ("_crawledTime", "_crawler")
+
+
+class Record:
+    """Fixed-shape row of one dataset, stored in ``__slots__`` instead of a per-row dict.
+
+    Subclasses list their JSON keys in ``FIELDS``, which double as the slot names.
+    ``OPTIONAL`` fields are left out of ``to_dict`` while unset, so output keeps the shape of
+    the dicts the scrapers used to build. ``key`` is the canonical encoding of ``KEY_FIELDS``
+    (every field except crawl bookkeeping by default), computed once and cached for dedup.
+    ``to_json`` is cached the same way, so only encode a record once it's complete.
+    """
+    __slots__ = ("_key", "_json")
+    FIELDS: Tuple[str, ...] = ()
+    OPTIONAL: Tuple[str, ...] = ()
+    KEY_FIELDS: Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "KEY_FIELDS" not in cls.__dict__:
+            cls.KEY_FIELDS = tuple(name for name in cls.FIELDS if name not in CRAWL_FIELDS and name not in cls.OPTIONAL)
+
+    def __init__(self, **fields):
+        unknown = fields.keys() - set(self.FIELDS)
+        if unknown:
+            raise TypeError(f"{type(self).__name__} has no fields {sorted(unknown)}")
+        self._key = self._json = None
+        for name in self.FIELDS:
+            setattr(self, name, fields.get(name))
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Record':
+        """Rebuild a record from a stored entry, ignoring keys the record doesn't know."""
+        return cls(**{name: data[name] for name in cls.FIELDS if name in data})
+
+    def to_dict(self) -> Dict:
+        optional = self.OPTIONAL
+        return {
+            name: value for name in self.FIELDS
+            if (value := getattr(self, name)) is not None or name not in optional
+        }
+
+    def to_json(self) -> bytes:
+        if self._json is None:
+            self._json = canonical(self.to_dict())
+        return self._json
+
+    @classmethod
+    def key_of(cls, data: Dict) -> bytes:
+        """``key`` of a stored entry, without building the record."""
+        return canonical([data.get(name) for name in cls.KEY_FIELDS])
+
+    @property
+    def key(self) -> bytes:
+        if self._key is None:
+            self._key = canonical([getattr(self, name) for name in self.KEY_FIELDS])
+        return self._key
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and all(getattr(self, n) == getattr(other, n) for n in self.FIELDS)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(f'{n}={getattr(self, n)!r}' for n in self.FIELDS)})"
+
+
+def to_dicts(records: Iterable[Record]) -> List[Dict]:
+    return [record.to_dict() for record in records]
+
+
+class Announcement(Record):
+    __slots__ = FIELDS = (
+        "TEXT", "HEADLINE", "DETAIL", "SYMBOL", "BROADCAST_DATE_TIME", "ATTACHMENT", "NEWS_TYPE",
+        "SUB_CAT_TYPE", "EXCHANGE", "COMPANY_NAME", "AUDIO_VIDEO_FILE", "SUB_TYPE", "NEWS_ID",
+        "NS_URL", "isAttachmentEmpty", "INSERTED_ON",
+    )
+    KEY_FIELDS = ("NEWS_ID",)
+
+
+class HighRecord(Record):
+    __slots__ = FIELDS = (
+        "currentPrice", "previousHigh", "previousHighDate", "newHigh", "allTimeHigh", "symbol",
+        "bseCode", "exchange", "group", "type", "_crawledTime", "_crawler",
+    )
+
+
+class LowRecord(Record):
+    __slots__ = FIELDS = (
+        "currentPrice", "previousLow", "previousLowDate", "newLow", "allTimeLow", "symbol",
+        "bseCode", "exchange", "group", "type", "_crawledTime", "_crawler",
+    )
+
+
+HIGH_LOW_RECORDS: Dict[str, Type[Record]] = {"high": HighRecord, "low": LowRecord}
+
+
+class VolumeRecord(Record):
+    __slots__ = FIELDS = (
+        "symbol", "company", "todayVolume", "twoWeekAvgVolume", "volumeChange", "turnover", "change",
+        "ltp", "changePer", "exchange", "volumeDelta", "ltpDelta", "turnoverDelta", "_crawledTime", "_crawler",
+    )
+    # Filled in by the state table for symbols that moved since the last snapshot.
+    OPTIONAL = ("volumeDelta", "ltpDelta", "turnoverDelta")
+
+
+class InsiderTrade(Record):
+    __slots__ = FIELDS = (
+        "symbol", "companyName", "nameOfPerson", "categoryOfPerson", "securityHeldPerTransaction",
+        "typeOfSecurities", "number", "value", "transactionType", "securitiesHeldPostTransaction",
+        "period", "modeOfAquisition", "reportedToExchange", "exchange", "_crawledTime", "_crawler",
+    )
+    # Only the HTML table path stamps these; the CSV download doesn't.
+    OPTIONAL = CRAWL_FIELDS
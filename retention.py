@@ -0,0 +1,146 @@
+import glob
+import gzip
+import json
+import os
+import shutil
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence
+
+ARCHIVE_DIR = os.environ.get("BSE_ARCHIVE_DIR", "archive")
+KEEP_DAYS = int(os.environ.get("BSE_RETENTION_KEEP_DAYS", "7"))
+BUDGET_BYTES = int(float(os.environ.get("BSE_RETENTION_BUDGET_MB", "1024")) * 2 ** 20)
+
+
+def file_date(path: str) -> Optional[str]:
+    """The ``YYYY-MM-DD`` a file name starts with, if it does."""
+    try:
+        return datetime.strptime(os.path.basename(path).split('_')[0], "%Y-%m-%d").strftime("%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+class RetentionManager:
+    """Manifest-driven rollover and retention for the files one service produces.
+
+    Every file the service writes is recorded with its date and size. The manifest keeps a
+    watermark of the last day seen, so the first record or rollover past midnight gzips the
+    previous days' files into the archive without scanning the working directory. Archives
+    older than ``keep_days`` go first, then the oldest ones until the total fits the budget.
+    Files recorded ``in_place`` (already compressed, or read where they are) skip the archive
+    and are expired from where they were written.
+    """
+
+    def __init__(self, name: str, adopt: Sequence[str] = (), archive_dir: str = ARCHIVE_DIR,
+                 keep_days: int = KEEP_DAYS, budget_bytes: int = BUDGET_BYTES, log: Callable[[str], None] = print):
+        self.name = name
+        self.adopt = adopt
+        self.archive_dir = archive_dir
+        self.keep_days = keep_days
+        self.budget_bytes = budget_bytes
+        self.log = log
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.archive_dir, f"{self.name}_manifest.json")
+
+    def _load(self) -> Dict:
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return self._bootstrap()
+        except (json.JSONDecodeError, IOError) as e:
+            self.log(f"Rebuilding unreadable manifest {self.manifest_path}: {e}")
+            return self._bootstrap()
+
+    def _bootstrap(self) -> Dict:
+        """One-time adoption of files written before the manifest existed."""
+        manifest = {"watermark": None, "files": {}}
+        for pattern in self.adopt:
+            for path in glob.glob(pattern):
+                date = file_date(path) or datetime.fromtimestamp(os.path.getmtime(path)).strftime("%Y-%m-%d")
+                manifest["files"][os.path.relpath(path)] = {"date": date, "size": os.path.getsize(path), "archived": False}
+        return manifest
+
+    def _save(self, manifest: Dict) -> None:
+        os.makedirs(self.archive_dir, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def record(self, *paths: str, when: Optional[datetime] = None, day: Optional[str] = None,
+               in_place: bool = False) -> None:
+        """Register files just written, dated ``day`` (default today); rolls the previous day over first."""
+        today = (when or datetime.now()).strftime("%Y-%m-%d")
+        manifest = self._load()
+        if manifest["watermark"] != today:
+            self._rollover(manifest, today)
+        for path in paths:
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                continue
+            manifest["files"][os.path.relpath(path)] = {"date": day or today, "size": size, "archived": in_place}
+        self._save(manifest)
+
+    def forget_missing(self) -> None:
+        """Drop files removed by someone else, such as columnar snapshots merged by compaction."""
+        manifest = self._load()
+        manifest["files"] = {path: entry for path, entry in manifest["files"].items() if os.path.exists(path)}
+        self._save(manifest)
+
+    def rollover(self, when: Optional[datetime] = None) -> None:
+        manifest = self._load()
+        self._rollover(manifest, (when or datetime.now()).strftime("%Y-%m-%d"))
+        self._save(manifest)
+
+    def live_files(self) -> List[str]:
+        return [path for path, entry in self._load()["files"].items() if not entry["archived"]]
+
+    def _rollover(self, manifest: Dict, today: str) -> None:
+        files = manifest["files"]
+        for path, entry in list(files.items()):
+            if entry["archived"] or entry["date"] >= today:
+                continue
+            archived = self._archive(path)
+            if archived is None and os.path.exists(path):
+                continue  # keep it on the manifest and retry at the next rollover
+            del files[path]
+            if archived:
+                files[archived] = {"date": entry["date"], "size": os.path.getsize(archived), "archived": True}
+        self._enforce(files, today)
+        manifest["watermark"] = today
+
+    def _archive(self, path: str) -> Optional[str]:
+        target = os.path.join(self.archive_dir, f"{os.path.basename(path)}.gz")
+        try:
+            os.makedirs(self.archive_dir, exist_ok=True)
+            with open(path, 'rb') as src, gzip.open(f"{target}.tmp", 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            os.replace(f"{target}.tmp", target)
+            os.remove(path)
+            self.log(f"Archived {path} to {target}")
+            return target
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            self.log(f"Failed to archive {path}: {e}")
+            return None
+
+    def _enforce(self, files: Dict[str, Dict], today: str) -> None:
+        cutoff = (datetime.strptime(today, "%Y-%m-%d") - timedelta(days=self.keep_days)).strftime("%Y-%m-%d")
+        archived = sorted((entry["date"], path) for path, entry in files.items() if entry["archived"])
+        total = sum(entry["size"] for entry in files.values())
+        for date, path in archived:
+            if date >= cutoff and total <= self.budget_bytes:
+                break
+            try:
+                os.remove(path)
+                self.log(f"Removed archived file: {path}")
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.log(f"Failed to remove {path}: {e}")
+                continue
+            total -= files.pop(path)["size"]
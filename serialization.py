@@ -0,0 +1,110 @@
+import json
+import os
+from typing import Any, Callable, Iterable, Optional
+
+# JSON backend: orjson or msgspec when installed, stdlib otherwise. BSE_JSON=orjson|msgspec|stdlib pins one.
+REQUESTED = os.environ.get("BSE_JSON", "").lower()
+
+orjson = msgspec = None
+if REQUESTED in ("", "orjson"):
+    try:
+        import orjson
+    except ImportError:
+        pass
+if orjson is None and REQUESTED in ("", "msgspec"):
+    try:
+        import msgspec
+    except ImportError:
+        pass
+
+BACKEND = "orjson" if orjson is not None else "msgspec" if msgspec is not None else "stdlib"
+if REQUESTED and REQUESTED != BACKEND:
+    print(f"JSON backend {REQUESTED!r} unavailable, using {BACKEND}")
+
+DECODE_ERRORS = (ValueError, msgspec.DecodeError) if msgspec is not None else (ValueError,)
+
+
+def _default(value):
+    # numpy scalars from pandas rows
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    _SORTED = orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def loads(data) -> Any:
+        return orjson.loads(data)
+
+    def canonical(obj) -> bytes:
+        return orjson.dumps(obj, default=_default, option=_SORTED)
+
+elif msgspec is not None:
+    _decoder = msgspec.json.Decoder()
+    _encoder = msgspec.json.Encoder(enc_hook=_default, order="sorted")
+
+    def loads(data) -> Any:
+        return _decoder.decode(data)
+
+    def canonical(obj) -> bytes:
+        return _encoder.encode(obj)
+
+else:
+    def loads(data) -> Any:
+        return json.loads(data)
+
+    def canonical(obj) -> bytes:
+        return json.dumps(obj, default=_default, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+
+canonical.__doc__ = "Compact UTF-8 JSON with sorted keys: the same bytes for the same value, for keys and bodies."
+
+
+def array(items: Iterable[bytes]) -> bytes:
+    """JSON array of already-encoded items."""
+    return b"[" + b",".join(items) + b"]"
+
+
+def read_entries(path: str) -> list:
+    with open(path, 'rb') as f:
+        data = f.read()
+    return loads(data).get('entries', []) if data else []
+
+
+def _entries_head(data: bytes) -> Optional[bytes]:
+    """``{"entries": [ ...`` of a day file with the closing ``]}`` cut off, or None if it isn't one."""
+    head = data.rstrip()
+    if not head.endswith(b"}"):
+        return None
+    head = head[:-1].rstrip()
+    if not head.endswith(b"]"):
+        return None
+    return head[:-1].rstrip()
+
+
+def append_entries(path: str, bodies: Iterable[bytes], log: Callable[[str], None] = print) -> None:
+    """Append encoded entries to a ``{"entries": [...]}`` day file, one per line.
+
+    What is already in the file is spliced in as bytes, never decoded or re-encoded. A file
+    that doesn't end the way a day file does is rewritten from its parsed entries, or
+    started over if it can't be parsed at all.
+    """
+    bodies = list(bodies)
+    try:
+        with open(path, 'rb') as f:
+            existing = f.read()
+    except FileNotFoundError:
+        existing = b""
+    head = _entries_head(existing) if existing.strip() else b'{"entries":['
+    if head is None:
+        try:
+            entries = loads(existing).get('entries', [])
+        except DECODE_ERRORS as e:
+            log(f"Starting over unreadable day file {path}: {e}")
+            entries = []
+        head = b'{"entries":[' + b",\n".join(canonical(entry) for entry in entries)
+    separator = b"\n" if head.endswith(b"[") else b",\n"
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(head + (separator + b",\n".join(bodies) if bodies else b"") + b"\n]}\n")
+    os.replace(tmp_path, path)
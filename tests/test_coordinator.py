@@ -0,0 +1,82 @@
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import time
+import unittest
+from collections import Counter
+from unittest import mock
+
+import announcements
+from coordinator import Coordinator
+
+PAGES, ROWS = 6, 10
+
+
+def row(news_id: str) -> dict:
+    return {"NEWSID": news_id, "SLONGNAME": "Alpha Power Ltd", "ATTACHMENTNAME": "a.pdf",
+            "NEWSSUB": "Alpha Power Ltd - 500001 - Outcome", "MORE": "", "HEADLINE": "Outcome.", "SCRIP_CD": 500001,
+            "DissemDT": "2026-10-19T10:00:00", "CATEGORYNAME": "Company Update", "SUBCATNAME": "General",
+            "AUDIO_VIDEO_FILE": None, "NSURL": ""}
+
+
+class SlowScraper:
+    """Serves PAGES pages of ROWS announcements with upstream-like latency."""
+    pool = None
+    ATTACHMENT_URL = ""
+
+    def get_pagination(self, day=None, default=1):
+        time.sleep(0.2)
+        return PAGES
+
+    def fetch_rows(self, page, day=None):
+        time.sleep(0.02)
+        return [row(f"{page}-{i}") for i in range(ROWS)]
+
+
+class TwoNodeSweepTest(unittest.TestCase):
+    def test_both_nodes_claim_pages_and_news(self):
+        uploads = Counter()
+        claims = {}
+
+        def node(name: str, db_path: str) -> announcements.ScraperScheduler:
+            coordinator = Coordinator(db_path, node_id=name)
+            claim = coordinator.claim
+
+            def counting_claim(prefix, limit=1, lane=None):
+                claimed = claim(prefix, limit, lane)
+                kind = "news" if prefix.startswith("news:") else "page" if ":page:" in prefix else "seed"
+                claims[name][kind] += len(claimed)
+                return claimed
+
+            coordinator.claim = counting_claim
+            claims[name] = Counter()
+            scheduler = announcements.ScraperScheduler(SlowScraper(), "", "", coordinator=coordinator)
+            scheduler._get_existing_attachments = lambda *args, **kwargs: []
+            scheduler._upload_data = lambda entries, *args: uploads.update(e.NEWS_ID for e in entries) or True
+            return scheduler
+
+        def convert(url, scraper):
+            time.sleep(0.01)
+            return "text"
+
+        with tempfile.TemporaryDirectory() as workdir, contextlib.redirect_stdout(io.StringIO()), \
+                mock.patch.object(announcements.PDFProcessor, "convert", convert):
+            db_path = os.path.join(workdir, "coordinator.db")
+            nodes = [node("node0", db_path), node("node1", db_path)]
+            threads = [threading.Thread(target=scheduler._run_interval, args=(True,)) for scheduler in nodes]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(uploads), PAGES * ROWS)
+        self.assertEqual(max(uploads.values()), 1)
+        for name, counts in claims.items():
+            self.assertGreater(counts["page"], 0, f"{name} claimed no sweep pages: {claims}")
+            self.assertGreater(counts["news"], 0, f"{name} claimed no announcements: {claims}")
+
+
+if __name__ == "__main__":
+    unittest.main()
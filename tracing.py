@@ -0,0 +1,196 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional
+
+from retention import RetentionManager
+
+# Opt-in: BSE_TRACE=1 emits a span tree per cycle. BSE_TRACE_PROFILE=cprofile|pyinstrument
+# additionally profiles each traced cycle and keeps the capture when the cycle runs for
+# at least BSE_TRACE_PROFILE_THRESHOLD seconds.
+TRACE_ENABLED = os.environ.get("BSE_TRACE", "").lower() in ("1", "true", "yes")
+PROFILER = os.environ.get("BSE_TRACE_PROFILE", "").lower()
+PROFILE_DIR = os.environ.get("BSE_TRACE_PROFILE_DIR", "profiles")
+PROFILE_THRESHOLD = float(os.environ.get("BSE_TRACE_PROFILE_THRESHOLD", "60"))
+_PROFILE_RETENTION: Dict[str, RetentionManager] = {}
+
+
+class Span:
+    def __init__(self, name: str, **counts):
+        self.name = name
+        self.counts: Dict[str, int] = dict(counts)
+        self.children: List['Span'] = []
+        self.start = time.perf_counter()
+        self.duration: Optional[float] = None
+
+    def count(self, **counts) -> None:
+        for key, value in counts.items():
+            self.counts[key] = self.counts.get(key, 0) + value
+
+    def finish(self) -> None:
+        self.duration = time.perf_counter() - self.start
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "ms": round((self.duration or 0) * 1000, 2),
+            **({"counts": self.counts} if self.counts else {}),
+            **({"children": [child.to_dict() for child in self.children]} if self.children else {}),
+        }
+
+
+class _NullSpan:
+    def count(self, **counts) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+_local = threading.local()
+
+
+def _stack() -> List[Span]:
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+class _Profiler:
+    def __init__(self, kind: str):
+        self.kind = kind
+        if kind == "pyinstrument":
+            from pyinstrument import Profiler
+            self._profiler = Profiler()
+        else:
+            import cProfile
+            self._profiler = cProfile.Profile()
+
+    def start(self) -> None:
+        self._profiler.start() if self.kind == "pyinstrument" else self._profiler.enable()
+
+    def stop(self) -> None:
+        self._profiler.stop() if self.kind == "pyinstrument" else self._profiler.disable()
+
+    def save(self, name: str) -> str:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        stem = os.path.join(PROFILE_DIR, f"{name}_{datetime.now().strftime('%Y-%m-%d_%H%M%S')}")
+        if self.kind == "pyinstrument":
+            path = f"{stem}.html"
+            with open(path, "w") as f:
+                f.write(self._profiler.output_html())
+        else:
+            path = f"{stem}.prof"
+            self._profiler.dump_stats(path)
+        return path
+
+
+def _start_profiler(profiler: Optional[_Profiler] = None) -> Optional[_Profiler]:
+    """(Re)start ``profiler``, or a new one of the configured kind; None if profiling is off or fails."""
+    if profiler is None and PROFILER not in ("cprofile", "pyinstrument"):
+        return None
+    try:
+        profiler = profiler or _Profiler(PROFILER)
+        profiler.start()
+        return profiler
+    except Exception as e:
+        # cProfile refuses to nest and pyinstrument may not be installed; trace without it.
+        print(f"Profiler unavailable ({PROFILER}): {e}")
+        return None
+
+
+@contextmanager
+def cycle(name: str, emit: Callable[[str], None] = print, **counts) -> Iterator:
+    """Root span for one scrape cycle; emits the finished span tree as a JSON line."""
+    if not TRACE_ENABLED or _stack():
+        with span(name, **counts) as nested:
+            yield nested
+        return
+
+    root = Span(name, **counts)
+    _stack().append(root)
+    profiler = _start_profiler()
+    try:
+        yield root
+    finally:
+        root.finish()
+        _stack().clear()
+        if profiler:
+            profiler.stop()
+        _report(root, emit, profiler)
+
+
+def _report(root: Span, emit: Callable[[str], None], profiler: Optional[_Profiler]) -> None:
+    emit(f"TRACE {json.dumps(root.to_dict())}")
+    if profiler and root.duration >= PROFILE_THRESHOLD:
+        path = profiler.save(root.name)
+        emit(f"Cycle {root.name} took {root.duration:.2f}s, profile saved to {path}")
+        if root.name not in _PROFILE_RETENTION:
+            _PROFILE_RETENTION[root.name] = RetentionManager(
+                f"{root.name}_profiles", adopt=[os.path.join(PROFILE_DIR, f"{root.name}_????-??-??_*")], log=emit)
+        _PROFILE_RETENTION[root.name].record(path)
+
+
+class Trace:
+    """Span tree for a job that runs interleaved with others on one thread.
+
+    ``active()`` swaps the job's own span stack in while it runs a step, so spans from
+    different jobs never nest into each other. Started inside a traced cycle, the job's tree
+    hangs off the cycle's current span; otherwise ``finish()`` emits it like ``cycle``, and
+    a top-level job is profiled across its steps just like a cycle.
+    """
+
+    def __init__(self, name: str, emit: Optional[Callable[[str], None]]):
+        self.root = Span(name)
+        self.stack = [self.root]
+        self.emit = emit
+        self.profiler: Optional[_Profiler] = None
+        self._profile = emit is not None
+
+    @contextmanager
+    def active(self) -> Iterator[Span]:
+        saved = _stack()
+        _local.stack = self.stack
+        if self._profile:
+            self.profiler = _start_profiler(self.profiler)
+            self._profile = self.profiler is not None
+        try:
+            yield self.stack[-1]
+        finally:
+            if self._profile:
+                self.profiler.stop()
+            _local.stack = saved
+
+    def finish(self) -> None:
+        self.root.finish()
+        if self.emit:
+            _report(self.root, self.emit, self.profiler)
+
+
+def start_trace(name: str, emit: Callable[[str], None] = print) -> Optional[Trace]:
+    if not TRACE_ENABLED:
+        return None
+    stack = _stack()
+    trace = Trace(name, None if stack else emit)
+    if stack:
+        stack[-1].children.append(trace.root)
+    return trace
+
+
+@contextmanager
+def span(name: str, **counts) -> Iterator:
+    """Child span of the active cycle on this thread; a no-op outside a traced cycle."""
+    stack = _stack()
+    if not stack:
+        yield _NULL_SPAN
+        return
+
+    child = Span(name, **counts)
+    stack[-1].children.append(child)
+    stack.append(child)
+    try:
+        yield child
+    finally:
+        child.finish()
+        stack.pop()
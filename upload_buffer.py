@@ -0,0 +1,73 @@
+import os
+from collections import deque
+from datetime import datetime
+from typing import Callable, Iterable, List, Optional
+
+import webhook
+from records import Announcement
+
+# Post a chunk once it holds this many announcements or this much encoded JSON.
+UPLOAD_CHUNK_ENTRIES = int(os.environ.get("BSE_UPLOAD_CHUNK_ENTRIES", "50"))
+UPLOAD_CHUNK_BYTES = int(float(os.environ.get("BSE_UPLOAD_CHUNK_MB", "4")) * 2 ** 20)
+
+
+class LatencyTracker:
+    """Announcement publish (DissemDT) to upload latency over the most recent uploads."""
+    def __init__(self, window: int = 500):
+        self.samples = deque(maxlen=window)
+
+    def record(self, broadcast_times: Iterable[str]) -> None:
+        now = datetime.now()
+        for broadcast_time in broadcast_times:
+            try:
+                published = datetime.fromisoformat(broadcast_time)
+            except (TypeError, ValueError):
+                continue
+            self.samples.append((now - published).total_seconds())
+
+    def summary(self) -> str:
+        ordered = sorted(self.samples)
+        if not ordered:
+            return "no samples"
+        pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+        return f"p50 {pick(0.5):.0f}s, p95 {pick(0.95):.0f}s, max {ordered[-1]:.0f}s over {len(ordered)} announcements"
+
+
+class UploadBuffer:
+    """Encoded announcements waiting to be posted, flushed as soon as a chunk is full."""
+    def __init__(self, upload: Callable[[List[bytes]], bool], latency: Optional[LatencyTracker] = None,
+                 max_entries: int = UPLOAD_CHUNK_ENTRIES, max_bytes: int = UPLOAD_CHUNK_BYTES):
+        self.upload = upload
+        self.latency = latency
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.uploaded = 0
+        self.failed_ids: List[str] = []
+        self._bodies: List[bytes] = []
+        self._ids: List[str] = []
+        self._published: List[str] = []
+        self._size = 0
+
+    def add(self, entry: Announcement) -> None:
+        body = webhook.encode(entry)
+        if self._bodies and self._size + len(body) > self.max_bytes:
+            self.flush()
+        self._bodies.append(body)
+        self._ids.append(entry.NEWS_ID)
+        self._published.append(entry.BROADCAST_DATE_TIME)
+        self._size += len(body)
+        if len(self._bodies) >= self.max_entries or self._size >= self.max_bytes:
+            self.flush()
+
+    def flush(self) -> bool:
+        if not self._bodies:
+            return True
+        ok = self.upload(self._bodies)
+        if ok:
+            self.uploaded += len(self._bodies)
+            if self.latency:
+                self.latency.record(self._published)
+        else:
+            self.failed_ids.extend(self._ids)
+        self._bodies, self._ids, self._published, self._size = [], [], [], 0
+        return ok
@@ -1,13 +1,25 @@
-from curl_cffi import requests
-import json
+from __future__ import annotations
 import time
 import schedule
 import os
-import glob
+import struct
+from array import array
 from datetime import datetime
-from typing import List, Dict, Set, Optional
+from typing import List, Dict, Optional, Tuple
 from loguru import logger
 
+import market_calendar
+import proxy_pool
+import serialization
+import tracing
+import webhook
+from columnar import ColumnarSink, to_float
+from retention import RetentionManager, file_date
+from lazy import lazy_import, report_startup
+from records import VolumeRecord, to_dicts
+
+requests = lazy_import("curl_cffi.requests")
+
 class VolumeScraper:
     BASE_URL = "https://api.bseindia.com/BseIndiaAPI/api/SpurtvolumeNew/w?flag=1"
     HEADERS = {
@@ -25,18 +37,20 @@ class VolumeScraper:
         'sec-ch-ua-platform': '"macOS"',
     }
 
-    def __init__(self, retries: int = 3, retry_delay: int = 10, proxies: Optional[Dict] = None):
+    def __init__(self, retries: int = 3, retry_delay: int = 10, proxies: Optional[Dict] = None,
+                 pool: Optional[proxy_pool.ProxyPool] = None):
         self.retries = retries
         self.retry_delay = retry_delay
         self.proxies = proxies or {}
+        self.pool = pool
 
-    def fetch_data(self) -> List[Dict]:
+    def fetch_data(self) -> List[VolumeRecord]:
         try:
             response = self._make_request('GET', self.BASE_URL)
             if not response:
                 logger.error("Failed to fetch volume data after retries")
                 return []
-            return self._process_data(response.json())
+            return self._process_data(serialization.loads(response.content))
         except Exception as e:
             logger.critical(f"Critical error in fetch_data: {str(e)}")
             return []
@@ -47,10 +61,13 @@ class VolumeScraper:
         headers = headers or self.HEADERS
         for attempt in range(1, self.retries + 1):
             try:
-                response = requests.request(
-                    method, url, headers=headers, data=data, proxies=self.proxies,
-                    cookies=cookies, json=json_data, timeout=60
-                )
+                with proxy_pool.route(self.proxies, self.pool) as route:
+                    response = requests.request(
+                        method, url, headers=headers, data=data, proxies=route.proxies,
+                        cookies=cookies, json=json_data, timeout=60
+                    )
+                    if response.status_code in proxy_pool.THROTTLED_STATUSES:
+                        route.fail()
                 response.raise_for_status()
                 return response
             except Exception as e:
@@ -71,8 +88,8 @@ class VolumeScraper:
         logger.error(f"All {self.retries} attempts failed for {method} {url}")
         return None
 
-    def _process_data(self, data_json: List[Dict]) -> List[Dict]:
-        return [{
+    def _process_data(self, data_json: List[Dict]) -> List[VolumeRecord]:
+        return [VolumeRecord(**{
             "symbol": item.get('scrip_cd', '').strip(),
             "company": item.get('scripname', '').strip(),
             "todayVolume": item.get('Trd_vol', '').strip(),
@@ -85,82 +102,187 @@ class VolumeScraper:
             "exchange": 'bse',
             "_crawledTime": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "_crawler": "volume_scraper",
-        } for item in data_json]
+        }) for item in data_json]
 
-def load_existing_entries() -> Set[str]:
-    seen = set()
-    for file in glob.glob("*_volume.json"):
-        try:
-            with open(file) as f:
-                data = json.load(f)
-                seen.update(json.dumps(entry, sort_keys=True) for entry in data.get('entries', []))
-        except (json.JSONDecodeError, IOError, KeyError) as e:
-            logger.error(f"Skipping invalid file {file}: {e}")
-    return seen
-
-def manage_files(output_filename: str):
-    today = datetime.today().date()
-    for path in glob.glob("*_volume.json"):
-        if path == output_filename:
-            continue
-        try:
-            file_date = datetime.strptime(os.path.basename(path).split('_')[0], "%Y-%m-%d").date()
-            if file_date < today:
-                os.remove(path)
-                logger.info(f"Removed outdated file: {path}")
-        except ValueError:
-            continue
-    
-    for path in glob.glob("logs/volume_*.log"):
+COLUMNAR_SINK = ColumnarSink("volume", [
+    ("symbol", ["symbol"], "str"),
+    ("company", ["company"], "str"),
+    ("todayVolume", ["todayVolume"], "int"),
+    ("twoWeekAvgVolume", ["twoWeekAvgVolume"], "int"),
+    ("volumeChange", ["volumeChange"], "float"),
+    ("turnover", ["turnover"], "float"),
+    ("change", ["change"], "float"),
+    ("ltp", ["ltp"], "float"),
+    ("changePer", ["changePer"], "float"),
+    ("volumeDelta", ["volumeDelta"], "int"),
+    ("ltpDelta", ["ltpDelta"], "float"),
+    ("turnoverDelta", ["turnoverDelta"], "float"),
+    ("exchange", ["exchange"], "str"),
+    ("crawledTime", ["_crawledTime"], "timestamp"),
+])
+
+class VolumeStateTable:
+    """Latest spurt-volume state per symbol, diffed against each new snapshot.
+
+    State lives in parallel ``array('d')`` columns indexed by symbol. Only symbols whose
+    volume, LTP or turnover moved are reported and appended to a compact day file of
+    fixed-size binary records, with the symbol dictionary kept in a sidecar text file.
+    Replaying the day file on startup restores the state after a restart.
+    """
+    RECORD = struct.Struct("<IIddd")  # epoch seconds, symbol index, volume, ltp, turnover
+    NAN = float("nan")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.symbols_path = f"{os.path.splitext(path)[0]}.symbols"
+        self.symbols: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.volume = array('d')
+        self.ltp = array('d')
+        self.turnover = array('d')
+        self._load()
+
+    def _slot(self, symbol: str) -> Tuple[int, bool]:
+        if symbol in self.index:
+            return self.index[symbol], False
+        idx = len(self.symbols)
+        self.symbols.append(symbol)
+        self.index[symbol] = idx
+        for column in (self.volume, self.ltp, self.turnover):
+            column.append(self.NAN)
+        return idx, True
+
+    def _load(self) -> None:
+        if not os.path.exists(self.symbols_path):
+            return
+        with open(self.symbols_path) as f:
+            for line in f:
+                self._slot(line.rstrip("\n"))
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as f:
+                data = f.read()
+            usable = len(data) - len(data) % self.RECORD.size  # drop a torn trailing record
+            for _, idx, volume, ltp, turnover in self.RECORD.iter_unpack(data[:usable]):
+                self.volume[idx], self.ltp[idx], self.turnover[idx] = volume, ltp, turnover
+
+    @staticmethod
+    def _same(new: float, old: float) -> bool:
+        return new == old or (new != new and old != old)  # NaN marks a missing value
+
+    @staticmethod
+    def _delta(new: float, old: float) -> Optional[float]:
+        return None if new != new or old != old else new - old
+
+    def apply(self, entries: List[VolumeRecord], when: Optional[datetime] = None) -> List[VolumeRecord]:
+        """Update state from a full snapshot and return the changed entries with their deltas set."""
+        stamp = int((when or datetime.now()).timestamp())
+        changed, records, new_symbols = [], [], []
+        for entry in entries:
+            volume, ltp, turnover = (
+                v if v is not None else self.NAN
+                for v in (to_float(entry.todayVolume), to_float(entry.ltp), to_float(entry.turnover))
+            )
+            idx, is_new = self._slot(entry.symbol or "")
+            if is_new:
+                new_symbols.append(entry.symbol or "")
+            old = (self.volume[idx], self.ltp[idx], self.turnover[idx])
+            if all(self._same(n, o) for n, o in zip((volume, ltp, turnover), old)):
+                continue
+            volume_delta, ltp_delta, turnover_delta = (self._delta(n, o) for n, o in zip((volume, ltp, turnover), old))
+            entry.volumeDelta = int(volume_delta) if volume_delta is not None else None
+            entry.ltpDelta = round(ltp_delta, 2) if ltp_delta is not None else None
+            entry.turnoverDelta = round(turnover_delta, 2) if turnover_delta is not None else None
+            changed.append(entry)
+            self.volume[idx], self.ltp[idx], self.turnover[idx] = volume, ltp, turnover
+            records.append(self.RECORD.pack(stamp, idx, volume, ltp, turnover))
+        self._persist(new_symbols, records)
+        return changed
+
+    def _persist(self, new_symbols: List[str], records: List[bytes]) -> None:
         try:
-            file_date_str = os.path.basename(path).split('_')[-1].split('.')[0]
-            file_date = datetime.strptime(file_date_str, "%Y-%m-%d").date()
-            if file_date < today:
-                os.remove(path)
-                logger.info(f"Removed outdated log file: {path}")
-        except (ValueError, IndexError):
-            continue
+            if new_symbols:
+                with open(self.symbols_path, 'a') as f:
+                    f.write("".join(f"{symbol}\n" for symbol in new_symbols))
+            if records:
+                with open(self.path, 'ab') as f:
+                    f.write(b"".join(records))
+        except IOError as e:
+            logger.error(f"Error persisting volume snapshot to {self.path}: {e}")
+
+    def history(self, symbol: str) -> List[Dict]:
+        """Intraday changes of one symbol, oldest first."""
+        idx = self.index.get(symbol)
+        if idx is None or not os.path.exists(self.path):
+            return []
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        data = data[:len(data) - len(data) % self.RECORD.size]
+        return [
+            {"time": datetime.fromtimestamp(stamp), "todayVolume": volume, "ltp": ltp, "turnover": turnover}
+            for stamp, i, volume, ltp, turnover in self.RECORD.iter_unpack(data) if i == idx
+        ]
+
+
+RETENTION = RetentionManager("volume", adopt=["*_volume.json", "*_volume_ts.*"], log=logger.info)
+
+_STATE_TABLES: Dict[str, VolumeStateTable] = {}
+
+def get_state_table() -> VolumeStateTable:
+    path = os.path.abspath(f"{datetime.now().strftime('%Y-%m-%d')}_volume_ts.bin")
+    if path not in _STATE_TABLES:
+        _STATE_TABLES.clear()
+        _STATE_TABLES[path] = VolumeStateTable(path)
+    return _STATE_TABLES[path]
 
 def is_market_hours() -> bool:
-    now = datetime.now()
-    return now.weekday() < 5 and datetime.strptime("08:15", "%H:%M").time() <= now.time() <= datetime.strptime("16:45", "%H:%M").time()
+    return market_calendar.is_market_hours()
 
-def upload_data(entries: List[Dict], webhook_url: str) -> bool:
+def upload_data(entries: List[VolumeRecord], webhook_url: str) -> bool:
     session = requests.Session()
     success = True
-    for entry in entries:
+    for batch, body, headers in webhook.requests_for(entries):
         response = None
+        name = f"{len(batch)} entries" if len(batch) > 1 else batch[0].company or 'unknown'
         for attempt in range(1, 3):
             try:
                 response = session.post(
                     webhook_url,
-                    json=entry,
+                    data=body,
+                    headers=headers,
                     timeout=30
                 )
                 response.raise_for_status()
-                logger.info(f"Uploaded {entry.get('company', 'unknown')} successfully")
+                logger.info(f"Uploaded {name} successfully")
                 break
             except Exception as e:
-                logger.warning(f"Upload attempt {attempt} for {entry.get('symbol', 'unknown')} failed: {str(e)}")
+                logger.warning(f"Upload attempt {attempt} for {name} failed: {str(e)}")
                 if attempt < 2:
                     sleep_time = 5 * attempt
                     logger.info(f"Waiting {sleep_time}s before retry...")
                     time.sleep(sleep_time)
         if not response or response.status_code >= 400:
             success = False
-            logger.error(f"Failed to upload {entry.get('company', 'unknown')}")
+            logger.error(f"Failed to upload {name}")
     return success
 
 def fetch_and_save_job(proxies: Optional[Dict] = None, webhook_url: Optional[str] = None):
     if not is_market_hours():
         return
+    with tracing.cycle("volume", emit=logger.info) as cycle:
+        _fetch_and_save(cycle, proxies, webhook_url)
+
+def _fetch_and_save(cycle, proxies: Optional[Dict], webhook_url: Optional[str]):
     logger.info("Fetching volume data...")
     scraper = VolumeScraper(proxies=proxies)
-    all_entries = scraper.fetch_data()
+    with tracing.span("fetch"):
+        all_entries = scraper.fetch_data()
     logger.info(f"Found {len(all_entries)} entries on website")
 
-    seen = load_existing_entries()
-    new_entries = [e for e in all_entries if json.dumps(e, sort_keys=True) not in seen]
+    with tracing.span("state_diff") as span:
+        state = get_state_table()
+        new_entries = state.apply(all_entries)
+        span.count(symbols=len(state.symbols))
+    cycle.count(fetched=len(all_entries), new=len(new_entries))
 
     if not new_entries:
         logger.info("No new entries found")
@@ -169,37 +291,34 @@ def fetch_and_save_job(proxies: Optional[Dict] = None, webhook_url: Optional[str
     current_date = datetime.now().strftime("%Y-%m-%d")
     output_file = f"{current_date}_volume.json"
 
-    existing = []
-    try:
-        if os.path.exists(output_file):
-            with open(output_file, 'r') as f:
-                file_content = f.read()
-                if file_content:
-                    existing = json.loads(file_content).get('entries', [])
-                else:
-                    logger.warning(f"Existing file {output_file} is empty.")
-    except (json.JSONDecodeError, IOError) as e:
-        logger.error(f"Error reading existing file {output_file}: {e}")
-        existing = []
+    with tracing.span("save", new=len(new_entries)):
+        try:
+            serialization.append_entries(output_file, (entry.to_json() for entry in new_entries), log=logger.error)
+            logger.info(f"Saved {len(new_entries)} new entries to {output_file}")
+            RETENTION.record(output_file, state.path, state.symbols_path)
+        except IOError as e:
+            logger.error(f"Error writing to output file {output_file}: {e}")
 
-    try:
-        with open(output_file, 'w') as f:
-            json.dump({"entries": existing + new_entries}, f, indent=2, sort_keys=True)
-        logger.info(f"Saved {len(new_entries)} new entries to {output_file}")
-    except IOError as e:
-        logger.error(f"Error writing to output file {output_file}: {e}")
+    if COLUMNAR_SINK.enabled:
+        with tracing.span("columnar_snapshot"):
+            if snapshot := COLUMNAR_SINK.write_snapshot(to_dicts(new_entries)):
+                RETENTION.record(snapshot, in_place=True)
 
     if webhook_url:
-        upload_success = upload_data(new_entries, webhook_url)
+        with tracing.span("upload", entries=len(new_entries)):
+            upload_success = upload_data(new_entries, webhook_url)
         logger.info("Upload completed successfully" if upload_success else "Upload failed")
     else:
         logger.warning("Webhook URL not provided, skipping upload.")
 
 def file_management_job():
-    if not is_market_hours():
-        return
-    current_date = datetime.now().strftime("%Y-%m-%d")
-    manage_files(f"{current_date}_volume.json")
+    RETENTION.rollover()
+
+def columnar_compaction_job():
+    for path in COLUMNAR_SINK.compact_all():
+        logger.info(f"Compacted columnar snapshots into {path}")
+        RETENTION.record(path, day=file_date(path), in_place=True)
+    RETENTION.forget_missing()
 
 def setup_logging():
     os.makedirs("logs", exist_ok=True)
@@ -209,6 +328,7 @@ def setup_logging():
         log_file,
         rotation="1 day",
         retention="7 days",
+        compression="gz",
         format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
         level="INFO"
     )
@@ -223,6 +343,7 @@ def setup_logging():
 def main():
     setup_logging()
     logger.info("Volume Scraper Service started. Press Ctrl+C to exit.")
+    report_startup("Volume Scraper Service", emit=logger.info)
     
     proxies = {
         "http": "",
@@ -230,10 +351,13 @@ def main():
     }
     webhook_url = "http://localhost:80/volume-data"
 
-    fetch_and_save_job(proxies=proxies, webhook_url=webhook_url)
+    poller = market_calendar.AdaptivePoller("volume")
+    poller.run(fetch_and_save_job, proxies=proxies, webhook_url=webhook_url)
     file_management_job()
-    schedule.every(5).minutes.do(fetch_and_save_job, proxies=proxies, webhook_url=webhook_url)
+    schedule.every(30).seconds.do(poller.run, fetch_and_save_job, proxies=proxies, webhook_url=webhook_url)
     schedule.every().hour.do(file_management_job)
+    if COLUMNAR_SINK.enabled:
+        schedule.every().day.at("17:00").do(columnar_compaction_job)
 
     try:
         while True:
@@ -0,0 +1,86 @@
+import gzip
+import os
+import struct
+from importlib.util import find_spec
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+import serialization
+from lazy import lazy_import
+from records import Record
+
+msgpack = lazy_import("msgpack")
+zstandard = lazy_import("zstandard")
+
+# Opt-in wire format for webhook uploads, for receivers that accept it:
+#   BSE_UPLOAD_FORMAT=json|ndjson|msgpack   json (default) keeps one object per POST for the
+#       per-entry scripts; ndjson and msgpack batch up to BSE_UPLOAD_BATCH entries per POST.
+#   BSE_UPLOAD_COMPRESSION=gzip|zstd        compress bodies of at least BSE_UPLOAD_COMPRESS_MIN_BYTES.
+FORMAT = os.environ.get("BSE_UPLOAD_FORMAT", "json").lower()
+COMPRESSION = os.environ.get("BSE_UPLOAD_COMPRESSION", "").lower()
+COMPRESS_MIN_BYTES = int(os.environ.get("BSE_UPLOAD_COMPRESS_MIN_BYTES", "1024"))
+BATCH_ENTRIES = int(os.environ.get("BSE_UPLOAD_BATCH", "500"))
+GZIP_LEVEL = 5
+
+if FORMAT == "msgpack" and find_spec("msgpack") is None:
+    print("msgpack unavailable, uploading NDJSON instead")
+    FORMAT = "ndjson"
+if COMPRESSION == "zstd" and find_spec("zstandard") is None:
+    print("zstandard unavailable, compressing uploads with gzip instead")
+    COMPRESSION = "gzip"
+if FORMAT not in ("json", "ndjson", "msgpack"):
+    raise ValueError(f"Unknown BSE_UPLOAD_FORMAT {FORMAT!r}")
+if COMPRESSION not in ("", "gzip", "zstd"):
+    raise ValueError(f"Unknown BSE_UPLOAD_COMPRESSION {COMPRESSION!r}")
+
+CONTENT_TYPES = {"json": "application/json", "ndjson": "application/x-ndjson", "msgpack": "application/msgpack"}
+
+
+def batched() -> bool:
+    """Whether per-entry receivers get batches; a plain JSON receiver expects one object per POST."""
+    return FORMAT != "json"
+
+
+def encode(record: Record) -> bytes:
+    """One record in the upload format; JSON and NDJSON reuse the record's cached canonical bytes."""
+    if FORMAT == "msgpack":
+        return msgpack.packb(record.to_dict())
+    return record.to_json()
+
+
+def _msgpack_array(items: List[bytes]) -> bytes:
+    n = len(items)
+    header = bytes([0x90 | n]) if n < 16 else struct.pack(">BH", 0xdc, n) if n < 2 ** 16 else struct.pack(">BI", 0xdd, n)
+    return header + b"".join(items)
+
+
+def compress(body: bytes, headers: Dict[str, str]) -> bytes:
+    """``body`` compressed when it's big enough to be worth it, with Content-Encoding set to match."""
+    if not COMPRESSION or len(body) < COMPRESS_MIN_BYTES:
+        return body
+    headers["Content-Encoding"] = COMPRESSION
+    if COMPRESSION == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(body)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def body(items: List[bytes], batch: bool = True) -> Tuple[bytes, Dict[str, str]]:
+    """Request body and headers for encoded items: a batch in the upload format, or a lone item as is."""
+    if not batch:
+        payload, = items
+    elif FORMAT == "ndjson":
+        payload = b"\n".join(items) + b"\n"
+    elif FORMAT == "msgpack":
+        payload = _msgpack_array(items)
+    else:
+        payload = serialization.array(items)
+    headers = {"Content-Type": CONTENT_TYPES[FORMAT]}
+    return compress(payload, headers), headers
+
+
+def requests_for(records: Sequence[Record]) -> Iterator[Tuple[Sequence[Record], bytes, Dict[str, str]]]:
+    """(records, body, headers) per POST for a per-entry receiver: one record each, or batches."""
+    size = BATCH_ENTRIES if batched() else 1
+    for start in range(0, len(records), size):
+        chunk = records[start:start + size]
+        payload, headers = body([encode(record) for record in chunk], batch=batched())
+        yield chunk, payload, headers
@@ -0,0 +1,103 @@
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import Iterator, Optional
+
+import tracing
+
+FRESH, BACKFILL = 0, 1
+# Opt-in per-minute BSE request budget for the two lanes; 0 leaves both unthrottled.
+REQUEST_BUDGET_PER_MINUTE = int(os.environ.get("BSE_REQUEST_BUDGET_PER_MIN", "0"))
+BACKFILL_SHARE = float(os.environ.get("BSE_BACKFILL_SHARE", "0.5"))
+
+
+class WorkQueue:
+    """Two-lane queue of generator jobs that yield after each step whether it hit BSE; fresh steps go first."""
+    def __init__(self, budget_per_minute: int = REQUEST_BUDGET_PER_MINUTE, backfill_share: float = BACKFILL_SHARE):
+        self.budget = budget_per_minute
+        self.backfill_limit = max(1, int(budget_per_minute * backfill_share))
+        self.failures = 0
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._requests = [deque(), deque()]
+        self._unfinished = [0, 0]
+
+    def submit(self, lane: int, job: Iterator[bool], trace: Optional[tracing.Trace] = None) -> None:
+        with self._cond:
+            heapq.heappush(self._heap, (lane, next(self._seq), job, trace))
+            self._unfinished[lane] += 1
+            self._cond.notify()
+
+    def pending(self, lane: int) -> int:
+        """Jobs submitted to ``lane`` that haven't finished, including one the worker is running."""
+        with self._cond:
+            return self._unfinished[lane]
+
+    def _finished(self, lane: int, trace: Optional[tracing.Trace]) -> None:
+        with self._cond:
+            self._unfinished[lane] -= 1
+        trace and trace.finish()
+
+    def _backfill_wait(self) -> float:
+        if not self.budget:
+            return 0.0
+        now = time.monotonic()
+        for requests in self._requests:
+            while requests and now - requests[0] >= 60:
+                requests.popleft()
+        backfill = self._requests[BACKFILL]
+        # The backfill lane has the whole budget to itself unless fresh work is competing for it.
+        limit = self.backfill_limit if self._requests[FRESH] else self.budget
+        if len(backfill) < limit:
+            return 0.0
+        return 60 - (now - backfill[-limit])
+
+    def _next(self, block: bool):
+        with self._cond:
+            while True:
+                wait = None
+                if self._heap:
+                    lane = self._heap[0][0]
+                    wait = self._backfill_wait() if lane == BACKFILL else 0.0
+                    if not wait:
+                        return heapq.heappop(self._heap)
+                elif not block:
+                    return None
+                self._cond.wait(wait)
+
+    def step(self, block: bool = True) -> bool:
+        """Advance the highest-priority job by one step; False once a non-blocking queue is empty."""
+        item = self._next(block)
+        if item is None:
+            return False
+        lane, seq, job, trace = item
+        try:
+            with trace.active() if trace else nullcontext():
+                requested = next(job)
+        except StopIteration:
+            self._finished(lane, trace)
+            return True
+        except Exception as e:
+            self.failures += 1
+            print(f"Job failed: {e}")
+            self._finished(lane, trace)
+            return True
+        with self._cond:
+            if requested and self.budget:
+                self._requests[lane].append(time.monotonic())
+            # Same sequence number: a job keeps its place among jobs of its lane.
+            heapq.heappush(self._heap, (lane, seq, job, trace))
+        return True
+
+    def drain(self) -> None:
+        while self.step(block=False):
+            pass
+
+    def run_forever(self) -> None:
+        while True:
+            self.step()